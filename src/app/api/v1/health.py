@@ -1,41 +1,72 @@
+import asyncio
+import time
 from datetime import datetime, timezone
-from typing import Dict
+from typing import Dict, Tuple
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response, status
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
-from ...core.database import get_database
+from ...core.config import get_settings
+from ...core.database import get_db
 
 router = APIRouter()
 
+_cached_timestamp: Tuple[int, str] = (0, "")
+
+
+def _utc_timestamp() -> str:
+    """
+    Current UTC time in ISO format, formatted at most once per second.
+
+    The value is truncated to whole seconds, so it carries no microseconds.
+    """
+    global _cached_timestamp
+    now = int(time.time())
+    if now != _cached_timestamp[0]:
+        _cached_timestamp = (
+            now,
+            datetime.fromtimestamp(now, timezone.utc).isoformat(),
+        )
+    return _cached_timestamp[1]
+
 
 @router.get("/")
 async def health_check() -> Dict[str, str]:
-    """Health check endpoint."""
+    """Liveness check endpoint; never touches the database."""
     return {
         "status": "healthy",
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": _utc_timestamp(),
         "service": "FastAPI MongoDB Boilerplate",
     }
 
 
 @router.get("/db")
+@router.get("/ready")
 async def database_health_check(
-    db: AsyncIOMotorDatabase = Depends(get_database),
+    response: Response,
+    db: AsyncIOMotorDatabase = Depends(get_db),
 ) -> Dict[str, str]:
-    """Database health check endpoint."""
+    """
+    Readiness check endpoint.
+
+    Pings the database with a short timeout so a flapping MongoDB fails the
+    probe quickly with a 503 instead of hanging until server selection gives up.
+    """
     try:
-        # Ping the database
-        await db.command("ping")
+        await asyncio.wait_for(
+            db.command("ping"), timeout=get_settings().MONGODB_PING_TIMEOUT
+        )
         return {
             "status": "healthy",
             "database": "connected",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": _utc_timestamp(),
         }
     except Exception as e:
+        error = "ping timed out" if isinstance(e, asyncio.TimeoutError) else str(e)
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
         return {
             "status": "unhealthy",
             "database": "disconnected",
-            "error": str(e),
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "error": error,
+            "timestamp": _utc_timestamp(),
         }
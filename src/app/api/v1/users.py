@@ -1,17 +1,160 @@
-from typing import List, Optional, Any
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from pydantic import EmailStr
 
+from ...core.exceptions import NotFoundException
+from ...core.responses import JSONArrayStreamingResponse, ORJSONResponse
 from ...models.user import User, UserCreate, UserUpdate
 from ...services.user import UserService
 
 router = APIRouter()
 
-
-def get_user_service() -> UserService:
-    """Dependency to get user service."""
-    return UserService()
+USER_NOT_FOUND = "User not found"
+
+# OpenAPI schemas for routes that return a response object directly, which
+# FastAPI cannot infer a schema from.
+_RECENT_USER_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "_id": {"type": "string"},
+        "username": {"type": "string"},
+        "email": {"type": "string", "format": "email"},
+        "full_name": {"type": ["string", "null"]},
+        "is_active": {"type": "boolean"},
+        "is_superuser": {"type": "boolean"},
+        "created_at": {"type": "string", "format": "date-time"},
+        "days_since_created": {"type": "integer"},
+        "has_full_name": {"type": "boolean"},
+        "email_domain": {"type": "string"},
+    },
+}
+
+_USER_STATISTICS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "total_users": {"type": "integer"},
+        "active_users": {"type": "integer"},
+        "superusers": {"type": "integer"},
+        "users_by_month": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "_id": {
+                        "type": "object",
+                        "properties": {
+                            "year": {"type": "integer"},
+                            "month": {"type": "integer"},
+                        },
+                    },
+                    "count": {"type": "integer"},
+                },
+            },
+        },
+        "average_username_length": {"type": "number"},
+    },
+}
+
+_ACTIVITY_STATUS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "_id": {"type": "boolean"},
+        "status": {"type": "string", "enum": ["active", "inactive"]},
+        "count": {"type": "integer"},
+        "users": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "string"},
+                    "username": {"type": "string"},
+                    "email": {"type": "string", "format": "email"},
+                    "full_name": {"type": ["string", "null"]},
+                    "created_at": {"type": "string", "format": "date-time"},
+                },
+            },
+        },
+    },
+}
+
+_GROWTH_MONTH_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "year": {"type": "integer"},
+        "month": {"type": "integer"},
+        "month_name": {"type": "string"},
+        "new_users": {"type": "integer"},
+        "active_users": {"type": "integer"},
+        "superusers": {"type": "integer"},
+    },
+}
+
+_SEARCH_RESULTS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "data": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "_id": {"type": "string"},
+                    "username": {"type": "string"},
+                    "email": {"type": "string", "format": "email"},
+                    "full_name": {"type": ["string", "null"]},
+                    "is_active": {"type": "boolean"},
+                    "is_superuser": {"type": "boolean"},
+                    "created_at": {"type": "string", "format": "date-time"},
+                    "updated_at": {"type": "string", "format": "date-time"},
+                    "score": {
+                        "type": "number",
+                        "description": "Text match score; absent for prefix search",
+                    },
+                },
+            },
+        },
+        "total": {"type": "integer"},
+        "facets": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "_id": {"type": "boolean"},
+                    "count": {"type": "integer"},
+                },
+            },
+        },
+        "pagination": {
+            "type": "object",
+            "properties": {
+                "skip": {"type": "integer"},
+                "limit": {"type": "integer"},
+                "has_more": {"type": "boolean"},
+            },
+        },
+    },
+}
+
+_DASHBOARD_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "statistics": _USER_STATISTICS_SCHEMA,
+        "activity": {"type": "array", "items": _ACTIVITY_STATUS_SCHEMA},
+        "growth": {"type": "array", "items": _GROWTH_MONTH_SCHEMA},
+        "recent_users": {"type": "array", "items": _RECENT_USER_SCHEMA},
+    },
+}
+
+
+def _json_response_doc(schema: Dict[str, Any]) -> Dict[int | str, Dict[str, Any]]:
+    """Document the JSON body of a 200 response with the given schema."""
+    return {200: {"content": {"application/json": {"schema": schema}}}}
+
+
+async def get_user_service(request: Request) -> UserService:
+    """Dependency to get the user service created at startup."""
+    user_service: UserService = request.app.state.user_service
+    return user_service
 
 
 @router.post("/", response_model=User, status_code=status.HTTP_201_CREATED)
@@ -30,10 +173,15 @@ async def create_user(
 async def get_users(
     skip: int = 0,
     limit: int = 100,
+    after_id: Optional[str] = Query(
+        None,
+        pattern="^[0-9a-fA-F]{24}$",
+        description="Return users after this id (ignores skip)",
+    ),
     user_service: UserService = Depends(get_user_service),
 ) -> List[User]:
     """Get all users with pagination."""
-    users = await user_service.get_users(skip=skip, limit=limit)
+    users = await user_service.get_users(skip=skip, limit=limit, after_id=after_id)
     return users
 
 
@@ -44,9 +192,7 @@ async def get_user(
     """Get user by ID."""
     user = await user_service.get_user(user_id)
     if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
-        )
+        raise NotFoundException(USER_NOT_FOUND)
     return user
 
 
@@ -57,9 +203,7 @@ async def get_user_by_email(
     """Get user by email."""
     user = await user_service.get_user_by_email(email)
     if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
-        )
+        raise NotFoundException(USER_NOT_FOUND)
     return user
 
 
@@ -70,9 +214,7 @@ async def get_user_by_username(
     """Get user by username."""
     user = await user_service.get_user_by_username(username)
     if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
-        )
+        raise NotFoundException(USER_NOT_FOUND)
     return user
 
 
@@ -86,9 +228,7 @@ async def update_user(
     try:
         user = await user_service.update_user(user_id, user_in)
         if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
-            )
+            raise NotFoundException(USER_NOT_FOUND)
         return user
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -101,9 +241,7 @@ async def delete_user(
     """Delete user."""
     success = await user_service.delete_user(user_id)
     if not success:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
-        )
+        raise NotFoundException(USER_NOT_FOUND)
 
 
 @router.get("/count/total")
@@ -118,42 +256,81 @@ async def get_users_count(
 # Aggregation Pipeline Endpoints
 
 
-@router.get("/analytics/statistics")
+@router.get(
+    "/analytics/statistics", responses=_json_response_doc(_USER_STATISTICS_SCHEMA)
+)
 async def get_user_statistics(
     user_service: UserService = Depends(get_user_service),
-) -> dict[str, Any]:
+) -> ORJSONResponse:
     """Get comprehensive user statistics using aggregation pipeline."""
-    return await user_service.get_user_statistics()
+    return ORJSONResponse(await user_service.get_user_statistics())
 
 
-@router.get("/analytics/activity-status")
+@router.get(
+    "/analytics/activity-status",
+    responses=_json_response_doc({"type": "array", "items": _ACTIVITY_STATUS_SCHEMA}),
+)
 async def get_users_by_activity_status(
     limit: int = Query(10, ge=1, le=100, description="Maximum users per status"),
     user_service: UserService = Depends(get_user_service),
-) -> List[dict[str, Any]]:
+) -> ORJSONResponse:
     """Get users grouped by activity status."""
-    return await user_service.get_users_by_activity_status(limit)
+    return ORJSONResponse(await user_service.get_users_by_activity_status(limit))
 
 
-@router.get("/analytics/recent-users")
+@router.get(
+    "/analytics/recent-users",
+    response_class=JSONArrayStreamingResponse,
+    responses=_json_response_doc({"type": "array", "items": _RECENT_USER_SCHEMA}),
+)
 async def get_recent_users_with_details(
     days: int = Query(30, ge=1, le=365, description="Number of days to look back"),
     user_service: UserService = Depends(get_user_service),
-) -> List[dict[str, Any]]:
-    """Get recent users with computed fields."""
-    return await user_service.get_recent_users_with_details(days)
+) -> JSONArrayStreamingResponse:
+    """Get recent users with computed fields, streamed as they are read."""
+    return JSONArrayStreamingResponse(user_service.iter_recent_users_with_details(days))
 
 
-@router.get("/analytics/growth-trend")
+@router.get(
+    "/analytics/growth-trend",
+    responses=_json_response_doc({"type": "array", "items": _GROWTH_MONTH_SCHEMA}),
+)
 async def get_user_growth_trend(
     months: int = Query(12, ge=1, le=60, description="Number of months to analyze"),
     user_service: UserService = Depends(get_user_service),
-) -> List[dict[str, Any]]:
+) -> ORJSONResponse:
     """Get user growth trend over time."""
-    return await user_service.get_user_growth_trend(months)
+    return ORJSONResponse(await user_service.get_user_growth_trend(months))
+
+
+@router.get("/analytics/dashboard", responses=_json_response_doc(_DASHBOARD_SCHEMA))
+async def get_dashboard_stats(
+    activity_limit: int = Query(
+        10, ge=1, le=100, description="Maximum users per status"
+    ),
+    recent_days: int = Query(
+        30, ge=1, le=365, description="Number of days to look back"
+    ),
+    growth_months: int = Query(
+        12, ge=1, le=60, description="Number of months to analyze"
+    ),
+    recent_limit: int = Query(
+        50, ge=1, le=500, description="Maximum number of recent users"
+    ),
+    user_service: UserService = Depends(get_user_service),
+) -> ORJSONResponse:
+    """Get statistics, activity, growth and recent users in one request."""
+    return ORJSONResponse(
+        await user_service.get_dashboard_stats(
+            activity_limit=activity_limit,
+            recent_days=recent_days,
+            growth_months=growth_months,
+            recent_limit=recent_limit,
+        )
+    )
 
 
-@router.get("/search/advanced")
+@router.get("/search/advanced", responses=_json_response_doc(_SEARCH_RESULTS_SCHEMA))
 async def search_users_advanced(
     search_term: str = Query(
         ..., description="Search term for username, email, or full name"
@@ -162,14 +339,17 @@ async def search_users_advanced(
     is_superuser: Optional[bool] = Query(
         None, description="Filter by superuser status"
     ),
-    sort_by: str = Query("created_at", description="Field to sort by"),
+    sort_by: str = Query("created_at", description="Field to sort by, or 'relevance'"),
     sort_order: int = Query(
         -1, ge=-1, le=1, description="Sort order: -1 for descending, 1 for ascending"
     ),
     limit: int = Query(20, ge=1, le=100, description="Maximum number of results"),
     skip: int = Query(0, ge=0, description="Number of results to skip"),
+    prefix: bool = Query(
+        False, description="Match the search term as a case-sensitive username prefix"
+    ),
     user_service: UserService = Depends(get_user_service),
-) -> dict[str, Any]:
+) -> ORJSONResponse:
     """Advanced user search with aggregation pipeline."""
     # Build filters
     filters = {}
@@ -178,11 +358,13 @@ async def search_users_advanced(
     if is_superuser is not None:
         filters["is_superuser"] = is_superuser
 
-    return await user_service.search_users_advanced(
+    results = await user_service.search_users_advanced(
         search_term=search_term,
         filters=filters if filters else None,
         sort_by=sort_by,
         sort_order=sort_order,
         limit=limit,
         skip=skip,
+        prefix=prefix,
     )
+    return ORJSONResponse(results)
@@ -1,6 +1,8 @@
 from enum import Enum
+from functools import lru_cache
 from os import getenv
-from pydantic_settings import BaseSettings
+from typing import Literal
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import field_validator
 
 
@@ -18,6 +20,31 @@ class DatabaseSettings(BaseSettings):
     MONGODB_DATABASE: str = getenv("MONGODB_DATABASE", default="fastapi_boilerplate")
     MONGODB_MAX_POOL_SIZE: int = int(getenv("MONGODB_MAX_POOL_SIZE", default="10"))
     MONGODB_MIN_POOL_SIZE: int = int(getenv("MONGODB_MIN_POOL_SIZE", default="1"))
+    MONGODB_MAX_IDLE_TIME_MS: int = int(
+        getenv("MONGODB_MAX_IDLE_TIME_MS", default="30000")
+    )
+    MONGODB_PING_TIMEOUT: float = float(getenv("MONGODB_PING_TIMEOUT", default="2.0"))
+
+
+# bcrypt only reads the first 72 bytes of a password and silently ignores the
+# rest, so longer passwords are rejected rather than truncated.
+BCRYPT_MAX_PASSWORD_BYTES = 72
+
+
+class SecuritySettings(BaseSettings):
+    PASSWORD_SCHEME: Literal["bcrypt", "argon2"] = "bcrypt"
+    BCRYPT_ROUNDS: int = int(getenv("BCRYPT_ROUNDS", default="12"))
+    ARGON2_TIME_COST: int = int(getenv("ARGON2_TIME_COST", default="3"))
+    ARGON2_MEMORY_COST: int = int(getenv("ARGON2_MEMORY_COST", default="65536"))
+    ARGON2_PARALLELISM: int = int(getenv("ARGON2_PARALLELISM", default="4"))
+    PASSWORD_VERIFY_CACHE_SIZE: int = int(
+        getenv("PASSWORD_VERIFY_CACHE_SIZE", default="0")
+    )
+
+    @field_validator("PASSWORD_SCHEME", mode="before")
+    @classmethod
+    def normalize_password_scheme(cls, v: str) -> str:
+        return v.lower() if isinstance(v, str) else v
 
 
 class EnvironmentOption(Enum):
@@ -43,8 +70,11 @@ class EnvironmentSettings(BaseSettings):
             return EnvironmentOption.LOCAL
 
 
-class Settings(AppSettings, DatabaseSettings, EnvironmentSettings):
-    pass
+class Settings(AppSettings, DatabaseSettings, SecuritySettings, EnvironmentSettings):
+    model_config = SettingsConfigDict(frozen=True)
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the application settings, read from the environment once."""
+    return Settings()
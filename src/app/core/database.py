@@ -1,10 +1,21 @@
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from .config import settings
+import asyncio
+import logging
+from typing import Dict
+
+from motor.motor_asyncio import (
+    AsyncIOMotorClient,
+    AsyncIOMotorCollection,
+    AsyncIOMotorDatabase,
+)
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
 
 
 class Database:
     client: AsyncIOMotorClient = None
     database: AsyncIOMotorDatabase = None
+    collections: Dict[str, AsyncIOMotorCollection] = {}
 
 
 db = Database()
@@ -12,22 +23,54 @@ db = Database()
 
 async def connect_to_mongo() -> None:
     """Create database connection."""
+    settings = get_settings()
     db.client = AsyncIOMotorClient(
         settings.MONGODB_URL,
         maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
         minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+        maxIdleTimeMS=settings.MONGODB_MAX_IDLE_TIME_MS,
+        # Read datetimes back as UTC-aware, matching the model defaults.
+        tz_aware=True,
     )
     db.database = db.client[settings.MONGODB_DATABASE]
-    print("Connected to MongoDB.")
+    db.collections = {}
+    logger.info(
+        "Connected to MongoDB (pool size %d-%d).",
+        settings.MONGODB_MIN_POOL_SIZE,
+        settings.MONGODB_MAX_POOL_SIZE,
+    )
+
+
+async def warm_up_mongo() -> None:
+    """Ping MongoDB so the first request does not pay for the handshake."""
+    try:
+        await asyncio.wait_for(
+            db.database.command("ping"), timeout=get_settings().MONGODB_PING_TIMEOUT
+        )
+    except Exception:
+        logger.warning("MongoDB did not answer the startup ping.", exc_info=True)
 
 
 async def close_mongo_connection() -> None:
     """Close database connection."""
     if db.client:
         db.client.close()
-        print("Disconnected from MongoDB.")
+        logger.info("Disconnected from MongoDB.")
 
 
 def get_database() -> AsyncIOMotorDatabase:
     """Get database instance."""
     return db.database
+
+
+def get_collection(name: str) -> AsyncIOMotorCollection:
+    """Get a collection, reusing the handle for the life of the connection."""
+    collection = db.collections.get(name)
+    if collection is None:
+        collection = db.collections[name] = db.database[name]
+    return collection
+
+
+async def get_db() -> AsyncIOMotorDatabase:
+    """Database dependency for routes, resolved on the event loop."""
+    return db.database
@@ -0,0 +1,35 @@
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+# Package logger all application modules log under (e.g. "src.app.core.database").
+APP_LOGGER_NAME = __name__.rsplit(".", 2)[0]
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(debug: bool = False) -> None:
+    """
+    Setup application logging.
+
+    Records are put on a queue and written to stderr by a QueueListener thread,
+    so logging from a coroutine never blocks the event loop on I/O.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    )
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    app_logger = logging.getLogger(APP_LOGGER_NAME)
+    app_logger.addHandler(QueueHandler(log_queue))
+    app_logger.setLevel(logging.DEBUG if debug else logging.INFO)
@@ -0,0 +1,48 @@
+from typing import Any, AsyncIterable, AsyncIterator, Dict
+
+import orjson
+from bson import ObjectId
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+# The Mongo client returns aware datetimes; OPT_NAIVE_UTC only covers naive
+# values built in code, which are assumed to be UTC.
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC
+
+
+def orjson_default(obj: Any) -> Any:
+    """Serialize the BSON types orjson does not handle natively."""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    raise TypeError
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson instead of the stdlib encoder."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=orjson_default, option=_ORJSON_OPTIONS)
+
+
+async def _json_array(rows: AsyncIterable[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    separator = b"["
+    async for row in rows:
+        yield separator + orjson.dumps(
+            row, default=orjson_default, option=_ORJSON_OPTIONS
+        )
+        separator = b","
+    yield b"[]" if separator == b"[" else b"]"
+
+
+class JSONArrayStreamingResponse(StreamingResponse):
+    """Stream rows as a JSON array, serializing each row as it arrives."""
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        rows: AsyncIterable[Dict[str, Any]],
+        status_code: int = 200,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(_json_array(rows), status_code=status_code, **kwargs)
@@ -1,4 +1,6 @@
-from contextlib import asynccontextmanager
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
 from typing import Any, AsyncIterator
 
 from fastapi import APIRouter, FastAPI
@@ -7,17 +9,43 @@ from .config import (
     AppSettings,
     EnvironmentSettings,
 )
-from .database import connect_to_mongo, close_mongo_connection
+from .database import connect_to_mongo, close_mongo_connection, warm_up_mongo
 from .error_handler import setup_exception_handlers
+from .logger import setup_logging
+from .responses import ORJSONResponse
+from ..repositories.user import UserRepository
+from ..services.user import UserService
+from ..utils.password import check_password_scheme
+
+logger = logging.getLogger(__name__)
+
+
+async def ensure_indexes() -> None:
+    """Create collection indexes, logging instead of failing startup."""
+    try:
+        await UserRepository().ensure_indexes()
+    except Exception:
+        logger.exception("Could not create MongoDB indexes")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     """Application lifespan manager."""
     # Startup
+    check_password_scheme()
     await connect_to_mongo()
+    await warm_up_mongo()
+    # Built per lifespan so its collection handles belong to this client.
+    app.state.user_service = UserService()
+    # Built in the background so an unreachable database does not hold up
+    # startup; the readiness probe reports it instead.
+    indexes = asyncio.create_task(ensure_indexes())
     yield
     # Shutdown
+    indexes.cancel()
+    # Let the task unwind before its client is closed underneath it
+    with suppress(asyncio.CancelledError):
+        await indexes
     await close_mongo_connection()
 
 
@@ -33,6 +61,10 @@ def create_application(
         }
         kwargs.update(to_update)
 
+    setup_logging(debug=isinstance(settings, EnvironmentSettings) and settings.DEBUG)
+
+    kwargs.setdefault("default_response_class", ORJSONResponse)
+
     application = FastAPI(lifespan=lifespan, **kwargs)
 
     # Setup global exception handlers
@@ -1,30 +1,51 @@
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Optional
 
 from bson import ObjectId
-from pydantic import BaseModel as PydanticBaseModel, Field, field_validator, ConfigDict
+from pydantic import (
+    BaseModel as PydanticBaseModel,
+    ConfigDict,
+    Field,
+    GetCoreSchemaHandler,
+    GetJsonSchemaHandler,
+)
+from pydantic.json_schema import JsonSchemaValue
+from pydantic_core import core_schema
+
+_UTCNOW = partial(datetime.now, timezone.utc)
+
+
+def _to_object_id(value: Any) -> ObjectId:
+    if isinstance(value, ObjectId):
+        return value
+    if ObjectId.is_valid(value):
+        return ObjectId(value)
+    raise ValueError(f"Invalid ObjectId: {value!r}")
 
 
 class PyObjectId(ObjectId):
     @classmethod
-    def __get_pydantic_core_schema__(cls, source_type, handler):
-        return handler(ObjectId)
+    def __get_pydantic_core_schema__(
+        cls, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            _to_object_id,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                str, when_used="json"
+            ),
+        )
 
     @classmethod
-    def __get_pydantic_json_schema__(cls, field_schema):
-        field_schema.update(type="string")
+    def __get_pydantic_json_schema__(
+        cls, schema: core_schema.CoreSchema, handler: GetJsonSchemaHandler
+    ) -> JsonSchemaValue:
+        return {"type": "string", "format": "objectid"}
 
 
 class BaseModel(PydanticBaseModel):
     id: Optional[PyObjectId] = Field(default=None, alias="_id")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
-
-    @field_validator("id", mode="before")
-    @classmethod
-    def validate_id(cls, v: Optional[object]) -> PyObjectId | object | None:
-        if isinstance(v, str):
-            return PyObjectId(v)
-        return v
+    created_at: datetime = Field(default_factory=_UTCNOW)
+    updated_at: datetime = Field(default_factory=_UTCNOW)
 
     model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
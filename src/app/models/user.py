@@ -1,7 +1,8 @@
 from typing import Optional
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, field_validator
 
+from ..core.config import BCRYPT_MAX_PASSWORD_BYTES, get_settings
 from .base import BaseModel as BaseModelWithId
 
 
@@ -24,6 +25,19 @@ class UserCreate(BaseModel):
     full_name: Optional[str] = Field(None, max_length=100)
     password: str = Field(..., min_length=8)
 
+    @field_validator("password")
+    @classmethod
+    def password_fits_bcrypt(cls, v: str) -> str:
+        """Reject passwords bcrypt would silently truncate; argon2 has no limit."""
+        if (
+            get_settings().PASSWORD_SCHEME == "bcrypt"
+            and len(v.encode("utf-8")) > BCRYPT_MAX_PASSWORD_BYTES
+        ):
+            raise ValueError(
+                f"Password must be at most {BCRYPT_MAX_PASSWORD_BYTES} bytes"
+            )
+        return v
+
 
 class UserUpdate(BaseModel):
     """User update model."""
@@ -1,16 +1,22 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar
+import logging
+from typing import Any, AsyncIterator, Dict, Generic, List, Optional, Type, TypeVar
 
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorCollection
 from pydantic import BaseModel
 
-from ..core.database import get_database
+from ..core.database import get_collection
 from ..models.base import BaseModel as BaseModelWithId
 
 ModelType = TypeVar("ModelType", bound=BaseModelWithId)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+logger = logging.getLogger(__name__)
+
+# Values model_dump() would convert rather than copy as they are.
+_NESTED_TYPES = (BaseModel, dict, list, tuple)
+
 
 class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """Base repository with common CRUD operations and aggregation support."""
@@ -18,29 +24,103 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType], collection_name: str):
         self.model = model
         self.collection_name = collection_name
-        self.collection: AsyncIOMotorCollection = get_database()[collection_name]
+        self.collection: AsyncIOMotorCollection = get_collection(collection_name)
+
+    def _construct(
+        self,
+        doc: Dict[str, Any],
+        model: Optional[Type[ModelType]] = None,
+        validate: bool = False,
+    ) -> ModelType:
+        """
+        Build a model instance from a stored document.
+
+        Documents were validated before they were written, so by default they
+        are loaded with model_construct and skip validation entirely. Pass
+        validate=True for data that may not have gone through the models.
+        """
+        model = model or self.model
+        if validate:
+            return model(**doc)
+        _id = doc.get("_id")
+        if isinstance(_id, str) and ObjectId.is_valid(_id):
+            doc["_id"] = ObjectId(_id)
+        return model.model_construct(**doc)
+
+    @staticmethod
+    def _to_document(obj_in: BaseModel) -> Dict[str, Any]:
+        """
+        Copy a validated model's fields into a new document.
 
-    async def create(self, obj_in: CreateSchemaType) -> ModelType:
+        Pydantic keeps validated values in __dict__, so for flat models a
+        shallow copy matches model_dump() without walking the serializer.
+        Models with extra fields or nested values still go through it.
+        """
+        if obj_in.__pydantic_extra__ or any(
+            isinstance(value, _NESTED_TYPES) for value in obj_in.__dict__.values()
+        ):
+            return obj_in.model_dump()
+        return dict(obj_in.__dict__)
+
+    async def create(
+        self, obj_in: CreateSchemaType, *, validate: bool = False
+    ) -> ModelType:
         """Create a new document."""
-        obj_data = obj_in.model_dump()
+        obj_data = self._to_document(obj_in)
         result = await self.collection.insert_one(obj_data)
         obj_data["_id"] = result.inserted_id
-        return self.model(**obj_data)
+        return self._construct(obj_data, validate=validate)
 
-    async def get(self, id: str) -> Optional[ModelType]:
+    async def create_many(self, objs_in: List[CreateSchemaType]) -> List[ModelType]:
+        """Create several documents with a single insert_many round trip."""
+        if not objs_in:
+            return []
+        docs = [self._to_document(obj_in) for obj_in in objs_in]
+        result = await self.collection.insert_many(docs, ordered=False)
+        for doc, inserted_id in zip(docs, result.inserted_ids):
+            doc["_id"] = inserted_id
+        return [self._construct(doc) for doc in docs]
+
+    async def get(self, id: str, *, validate: bool = False) -> Optional[ModelType]:
         """Get a document by ID."""
         if not ObjectId.is_valid(id):
             return None
         obj_data = await self.collection.find_one({"_id": ObjectId(id)})
         if obj_data:
-            return self.model(**obj_data)
+            return self._construct(obj_data, validate=validate)
         return None
 
-    async def get_multi(self, *, skip: int = 0, limit: int = 100) -> List[ModelType]:
-        """Get multiple documents with pagination."""
-        cursor = self.collection.find().skip(skip).limit(limit)
+    async def get_multi(
+        self,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[str] = None,
+        validate: bool = False,
+    ) -> List[ModelType]:
+        """
+        Get multiple documents with pagination.
+
+        Documents are returned in _id order, so the last _id of a page can be
+        passed as after_id to get the next one. That walks the _id index
+        directly, so the cost stays proportional to limit however deep the
+        page is, unlike skip.
+        """
+        query: Dict[str, Any] = {}
+        if after_id is not None:
+            if not ObjectId.is_valid(after_id):
+                return []
+            query = {"_id": {"$gt": ObjectId(after_id)}}
+            skip = 0
+        cursor = (
+            self.collection.find(query)
+            .sort("_id", 1)
+            .skip(skip)
+            .limit(limit)
+            .batch_size(limit)
+        )
         documents: List[Dict[str, Any]] = await cursor.to_list(length=limit)
-        return [self.model(**doc) for doc in documents]
+        return [self._construct(doc, validate=validate) for doc in documents]
 
     async def update(self, *, id: str, obj_in: UpdateSchemaType) -> Optional[ModelType]:
         """Update a document."""
@@ -65,16 +145,21 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         return bool(result.deleted_count)
 
     async def count(self) -> int:
-        """Count total documents in collection."""
-        count: int = await self.collection.count_documents({})
+        """Count total documents in collection from collection metadata."""
+        count: int = await self.collection.estimated_document_count()
+        return count
+
+    async def count_filtered(self, query: Dict[str, Any]) -> int:
+        """Count documents matching a query exactly."""
+        count: int = await self.collection.count_documents(query)
         return count
 
     async def exists(self, id: str) -> bool:
         """Check if document exists."""
         if not ObjectId.is_valid(id):
             return False
-        result: int = await self.collection.count_documents({"_id": ObjectId(id)})
-        return result > 0
+        doc = await self.collection.find_one({"_id": ObjectId(id)}, {"_id": 1})
+        return doc is not None
 
     # Aggregation Pipeline Methods
     async def aggregate(
@@ -94,16 +179,53 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             cursor = self.collection.aggregate(pipeline, allowDiskUse=allow_disk_use)
             results: List[Dict[str, Any]] = await cursor.to_list(length=None)
             return results
-        except Exception as e:
-            # Log the error in production
-            print(f"Aggregation error: {e}")
+        except Exception:
+            logger.exception("Aggregation error on %s", self.collection_name)
             return []
 
+    async def aiter_aggregate(
+        self,
+        pipeline: List[Dict[str, Any]],
+        allow_disk_use: bool = False,
+        batch_size: int = 500,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute an aggregation pipeline and yield results one at a time.
+
+        Unlike aggregate(), results are never collected into a list, so peak
+        memory is bounded by the cursor batch size rather than the result size.
+
+        Args:
+            pipeline: List of aggregation stages
+            allow_disk_use: Whether to allow disk use for large operations
+            batch_size: Number of documents fetched per round trip
+
+        Yields:
+            Aggregation results
+
+        A failure before the first result yields nothing, like aggregate().
+        Once results have been yielded the error is re-raised, so a partial
+        stream is aborted instead of looking complete.
+        """
+        started = False
+        try:
+            cursor = self.collection.aggregate(
+                pipeline, allowDiskUse=allow_disk_use, batchSize=batch_size
+            )
+            async for doc in cursor:
+                started = True
+                yield doc
+        except Exception:
+            logger.exception("Aggregation error on %s", self.collection_name)
+            if started:
+                raise
+
     async def aggregate_with_model(
         self,
         pipeline: List[Dict[str, Any]],
         model_class: Optional[Type[ModelType]] = None,
         allow_disk_use: bool = False,
+        validate: bool = False,
     ) -> List[ModelType]:
         """
         Execute an aggregation pipeline and return results as model instances.
@@ -112,13 +234,13 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             pipeline: List of aggregation stages
             model_class: Model class to instantiate results (defaults to self.model)
             allow_disk_use: Whether to allow disk use for large operations
+            validate: Whether to validate results instead of constructing them
 
         Returns:
             List of model instances
         """
-        model = model_class or self.model
         results = await self.aggregate(pipeline, allow_disk_use)
-        return [model(**doc) for doc in results]
+        return [self._construct(doc, model_class, validate) for doc in results]
 
     async def aggregate_single(
         self, pipeline: List[Dict[str, Any]], allow_disk_use: bool = False
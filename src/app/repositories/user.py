@@ -1,68 +1,507 @@
-from typing import Optional, List, Dict, Any
-
+import asyncio
+import hashlib
+import hmac
+import logging
+import os
+import re
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List, Dict, Any, AsyncIterator, Tuple, Union
+
+from bson import ObjectId
+from pymongo import TEXT
+
+from ..core.config import get_settings
 from ..models.user import User, UserCreate, UserUpdate
-from ..utils.password import hash_password, verify_password
+from ..utils.password import (
+    hash_password_async,
+    hash_passwords_bulk_async,
+    needs_rehash,
+    verify_password_async,
+)
 from .base import BaseRepository
 
+logger = logging.getLogger(__name__)
+
+# Static aggregation stages, built once at import and shared by every call.
+# They are passed to the driver as-is and must be treated as read-only.
+
+# One pass over the collection: per-month counters are summed into the totals,
+# so each document is read once instead of once per statistic.
+_USER_STATS_PIPELINE: Tuple[Dict[str, Any], ...] = (
+    {
+        "$group": {
+            "_id": {
+                "year": {"$year": "$created_at"},
+                "month": {"$month": "$created_at"},
+            },
+            "count": {"$sum": 1},
+            "active_users": {"$sum": {"$cond": ["$is_active", 1, 0]}},
+            "superusers": {"$sum": {"$cond": ["$is_superuser", 1, 0]}},
+            "username_length": {"$sum": {"$strLenCP": "$username"}},
+        }
+    },
+    {"$sort": {"_id.year": 1, "_id.month": 1}},
+    {
+        "$group": {
+            "_id": None,
+            "total_users": {"$sum": "$count"},
+            "active_users": {"$sum": "$active_users"},
+            "superusers": {"$sum": "$superusers"},
+            "username_length": {"$sum": "$username_length"},
+            "users_by_month": {"$push": {"_id": "$_id", "count": "$count"}},
+        }
+    },
+)
+
+_ACTIVITY_GROUP_STAGE: Dict[str, Any] = {
+    "$group": {
+        "_id": "$is_active",
+        "users": {
+            "$push": {
+                "id": "$_id",
+                "username": "$username",
+                "email": "$email",
+                "full_name": "$full_name",
+                "created_at": "$created_at",
+            }
+        },
+        "count": {"$sum": 1},
+    }
+}
+
+_ACTIVITY_STATUS_EXPR: Dict[str, Any] = {
+    "$cond": {"if": "$_id", "then": "active", "else": "inactive"}
+}
+
+_RECENT_USERS_TAIL: Tuple[Dict[str, Any], ...] = (
+    {
+        "$project": {
+            "_id": 1,
+            "username": 1,
+            "email": 1,
+            "full_name": 1,
+            "is_active": 1,
+            "is_superuser": 1,
+            "created_at": 1,
+            "days_since_created": 1,
+            "has_full_name": 1,
+            "email_domain": 1,
+        }
+    },
+    {"$sort": {"created_at": -1}},
+)
+
+
+def _recent_users_pipeline(days: int) -> List[Dict[str, Any]]:
+    """Build the recent users pipeline for the given look-back window."""
+    now = datetime.now(timezone.utc)
+    cutoff_date = now - timedelta(days=days)
+
+    return [
+        {"$match": {"created_at": {"$gte": cutoff_date}}},
+        {
+            "$addFields": {
+                "days_since_created": {
+                    "$floor": {
+                        "$divide": [
+                            {"$subtract": [now, "$created_at"]},
+                            1000 * 60 * 60 * 24,  # milliseconds in a day
+                        ]
+                    }
+                },
+                "has_full_name": {"$ne": ["$full_name", None]},
+                "email_domain": {
+                    "$substr": ["$email", {"$indexOfBytes": ["$email", "@"]}, -1]
+                },
+            }
+        },
+        *_RECENT_USERS_TAIL,
+    ]
+
+
+def _activity_pipeline(limit: int) -> List[Dict[str, Any]]:
+    """Build the activity status pipeline, keeping limit users per status."""
+    return [
+        _ACTIVITY_GROUP_STAGE,
+        {
+            "$project": {
+                "status": _ACTIVITY_STATUS_EXPR,
+                "count": 1,
+                "users": {"$slice": ["$users", limit]},
+            }
+        },
+        {"$sort": {"count": -1}},
+    ]
+
+
+_MONTH_NAMES = (
+    "January",
+    "February",
+    "March",
+    "April",
+    "May",
+    "June",
+    "July",
+    "August",
+    "September",
+    "October",
+    "November",
+    "December",
+)
+
+_GROWTH_PIPELINE_TAIL: Tuple[Dict[str, Any], ...] = (
+    {
+        "$group": {
+            "_id": {
+                "year": {"$year": "$created_at"},
+                "month": {"$month": "$created_at"},
+            },
+            "new_users": {"$sum": 1},
+            "active_users": {"$sum": {"$cond": ["$is_active", 1, 0]}},
+            "superusers": {"$sum": {"$cond": ["$is_superuser", 1, 0]}},
+        }
+    },
+    {
+        "$project": {
+            "_id": 0,
+            "year": "$_id.year",
+            "month": "$_id.month",
+            "new_users": 1,
+            "active_users": 1,
+            "superusers": 1,
+            "month_name": {
+                "$switch": {
+                    "branches": [
+                        {"case": {"$eq": ["$_id.month", number]}, "then": name}
+                        for number, name in enumerate(_MONTH_NAMES, start=1)
+                    ],
+                    "default": "Unknown",
+                }
+            },
+        }
+    },
+    {"$sort": {"year": 1, "month": 1}},
+)
+
+
+def _growth_pipeline(months: int) -> List[Dict[str, Any]]:
+    """Build the monthly growth pipeline for the given number of months."""
+    end_date = datetime.now(timezone.utc)
+    start_date = end_date - timedelta(days=months * 30)
+    return [
+        {"$match": {"created_at": {"$gte": start_date, "$lte": end_date}}},
+        *_GROWTH_PIPELINE_TAIL,
+    ]
+
+
+def _format_user_statistics(result: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Shape the output of the user statistics pipeline for the API."""
+    if not result:
+        return {
+            "total_users": 0,
+            "active_users": 0,
+            "superusers": 0,
+            "users_by_month": [],
+            "average_username_length": 0,
+        }
+
+    total_users = result["total_users"]
+    return {
+        "total_users": total_users,
+        "active_users": result["active_users"],
+        "superusers": result["superusers"],
+        "users_by_month": result["users_by_month"],
+        "average_username_length": (
+            round(result["username_length"] / total_users, 2) if total_users else 0
+        ),
+    }
+
+
+_SEARCH_PROJECT_STAGE: Dict[str, Any] = {
+    "$project": {
+        "_id": 1,
+        "username": 1,
+        "email": 1,
+        "full_name": 1,
+        "is_active": 1,
+        "is_superuser": 1,
+        "created_at": 1,
+        "updated_at": 1,
+        "score": 1,
+    }
+}
+
+_SEARCH_SCORE_STAGE: Dict[str, Any] = {"$addFields": {"score": {"$meta": "textScore"}}}
+
+_AUTH_PROJECTION: Dict[str, int] = {
+    "_id": 1,
+    "email": 1,
+    "username": 1,
+    "full_name": 1,
+    "is_active": 1,
+    "is_superuser": 1,
+    "hashed_password": 1,
+    "created_at": 1,
+    "updated_at": 1,
+}
+
+_USER_INDEXES: Tuple[Tuple[Any, Dict[str, Any]], ...] = (
+    (
+        [("username", TEXT), ("email", TEXT), ("full_name", TEXT)],
+        {"name": "user_text_search"},
+    ),
+    ("email", {"unique": True}),
+    ("username", {"unique": True}),
+)
+
+_CONFLICT_PROJECTION: Dict[str, int] = {"_id": 0, "email": 1, "username": 1}
+
+_VERIFY_PROJECTION: Dict[str, int] = {"_id": 0, "email": 1, "hashed_password": 1}
+
+# With PASSWORD_VERIFY_CACHE_SIZE set, successful verifications are remembered
+# per repository, keyed by email and an HMAC-SHA256 of the password and checked
+# against the hash currently stored. The per-process key only helps if the
+# digests leak without it: anyone who can read the cache from memory can read
+# the key too and test guesses at HMAC speed instead of hash speed. The cache
+# is off by default.
+_VERIFY_CACHE_KEY = os.urandom(32)
+
+_SEARCH_FACETS: Tuple[Dict[str, Any], ...] = (
+    {"$group": {"_id": "$is_active", "count": {"$sum": 1}}},
+)
+
 
 class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
     """User repository with user-specific operations and aggregations."""
 
     def __init__(self):
         super().__init__(User, "users")
+        self._verify_cache_size = get_settings().PASSWORD_VERIFY_CACHE_SIZE
+        self._verify_cache: OrderedDict[Tuple[str, bytes], str] = OrderedDict()
+
+    async def _verify_password(
+        self, email: str, password: Union[str, bytes], hashed_password: str
+    ) -> bool:
+        """
+        Verify a password, skipping the hash for a recently verified match.
+
+        Only caches when PASSWORD_VERIFY_CACHE_SIZE is set. A cache hit only
+        counts while the stored hash is unchanged, so a password change or
+        rehash invalidates it. Failures are never cached.
+        """
+        if not self._verify_cache_size:
+            return await verify_password_async(password, hashed_password)
+        if isinstance(password, str):
+            password = password.encode("utf-8")
+        key = (email, hmac.new(_VERIFY_CACHE_KEY, password, hashlib.sha256).digest())
+        cached = self._verify_cache.get(key)
+        if cached is not None and hmac.compare_digest(
+            cached.encode("utf-8"), hashed_password.encode("utf-8")
+        ):
+            self._verify_cache.move_to_end(key)
+            return True
+        if not await verify_password_async(password, hashed_password):
+            return False
+        self._verify_cache[key] = hashed_password
+        self._verify_cache.move_to_end(key)
+        if len(self._verify_cache) > self._verify_cache_size:
+            self._verify_cache.popitem(last=False)
+        return True
+
+    async def ensure_indexes(self) -> None:
+        """
+        Create the indexes user lookups and uniqueness checks rely on.
+
+        Each index is built on its own, so existing duplicates that block a
+        unique index do not also leave search without its text index.
+        """
+        for keys, options in _USER_INDEXES:
+            try:
+                await self.collection.create_index(keys, **options)
+            except Exception:
+                logger.exception(
+                    "Could not create index %s on %s",
+                    options.get("name", keys),
+                    self.collection_name,
+                )
 
     async def get_by_email(self, email: str) -> Optional[User]:
         """Get user by email."""
         user_data = await self.collection.find_one({"email": email})
         if user_data:
-            return User(**user_data)
+            return self._construct(user_data)
         return None
 
     async def get_by_username(self, username: str) -> Optional[User]:
         """Get user by username."""
         user_data = await self.collection.find_one({"username": username})
         if user_data:
-            return User(**user_data)
+            return self._construct(user_data)
         return None
 
     async def create_user(self, user_in: UserCreate) -> User:
         """Create a new user with password hashing."""
-        user_data = user_in.model_dump()
+        user_data = self._to_document(user_in)
         password = user_data.pop("password")
 
-        # Hash the password before storing
-        hashed_password = hash_password(password)
+        # Hash the password before storing, off the event loop
+        hashed_password = await hash_password_async(password)
         user_data["hashed_password"] = hashed_password
 
         result = await self.collection.insert_one(user_data)
         user_data["_id"] = result.inserted_id
 
-        return User(**user_data)
+        return self._construct(user_data)
+
+    async def create_users(self, users_in: List[UserCreate]) -> List[User]:
+        """Create several users, hashing their passwords concurrently."""
+        if not users_in:
+            return []
+        users_data = [self._to_document(user_in) for user_in in users_in]
+        hashed_passwords = await hash_passwords_bulk_async(
+            [user_data.pop("password") for user_data in users_data]
+        )
+        for user_data, hashed_password in zip(users_data, hashed_passwords):
+            user_data["hashed_password"] = hashed_password
+
+        result = await self.collection.insert_many(users_data, ordered=False)
+        for user_data, inserted_id in zip(users_data, result.inserted_ids):
+            user_data["_id"] = inserted_id
+
+        return [self._construct(user_data) for user_data in users_data]
+
+    async def create(self, obj_in: UserCreate, *, validate: bool = False) -> User:
+        """Create a user, hashing the password like create_user."""
+        return await self.create_user(obj_in)
+
+    async def create_many(self, objs_in: List[UserCreate]) -> List[User]:
+        """Create several users, hashing their passwords like create_users."""
+        return await self.create_users(objs_in)
 
     async def is_email_taken(self, email: str) -> bool:
         """Check if email is already taken."""
-        result = await self.collection.count_documents({"email": email})
-        return bool(result)
+        doc = await self.collection.find_one({"email": email}, {"_id": 1})
+        return doc is not None
 
     async def is_username_taken(self, username: str) -> bool:
         """Check if username is already taken."""
-        result = await self.collection.count_documents({"username": username})
-        return bool(result)
+        doc = await self.collection.find_one({"username": username}, {"_id": 1})
+        return doc is not None
+
+    async def find_conflicting(
+        self,
+        email: Optional[str] = None,
+        username: Optional[str] = None,
+        exclude_id: Optional[str] = None,
+    ) -> Tuple[bool, bool]:
+        """
+        Check whether an email and username are taken in one round trip.
+
+        Only the two fields are projected, so the result stays small even
+        if duplicates exist from before the unique indexes were built.
+
+        Args:
+            email: Email to check, if any
+            username: Username to check, if any
+            exclude_id: ID of a user whose own values do not count as taken
+
+        Returns:
+            Tuple of (email_taken, username_taken)
+        """
+        clauses: List[Dict[str, Any]] = []
+        if email:
+            clauses.append({"email": email})
+        if username:
+            clauses.append({"username": username})
+        if not clauses:
+            return False, False
+
+        query: Dict[str, Any] = {"$or": clauses}
+        if exclude_id and ObjectId.is_valid(exclude_id):
+            query["_id"] = {"$ne": ObjectId(exclude_id)}
+        cursor = self.collection.find(query, _CONFLICT_PROJECTION)
+        docs: List[Dict[str, Any]] = await cursor.to_list(length=None)
+        return (
+            bool(email) and any(doc.get("email") == email for doc in docs),
+            bool(username) and any(doc.get("username") == username for doc in docs),
+        )
+
+    async def authenticate(
+        self, email: str, password: Union[str, bytes]
+    ) -> Optional[User]:
+        """
+        Get a user by email if the password matches.
 
-    async def verify_user_password(self, email: str, password: str) -> bool:
-        """Verify a user's password."""
+        Fetches the user and checks the password in a single round trip, so
+        login flows do not need a separate lookup after verifying. Hashes made
+        with an outdated scheme or cost are upgraded on a successful login.
+        """
+        user_data = await self.collection.find_one({"email": email}, _AUTH_PROJECTION)
+        if not user_data or "hashed_password" not in user_data:
+            return None
+        if not await self._verify_password(
+            email, password, user_data["hashed_password"]
+        ):
+            return None
+        verified_hash = user_data["hashed_password"]
+        if needs_rehash(verified_hash):
+            try:
+                hashed_password = await hash_password_async(password)
+            except ValueError:
+                # Too long for bcrypt: keep the hash that just verified.
+                return self._construct(user_data)
+            user_data["hashed_password"] = hashed_password
+            # Only replace the hash that was verified, so a password change
+            # made while this login was hashing is not overwritten.
+            await self.collection.update_one(
+                {"_id": user_data["_id"], "hashed_password": verified_hash},
+                {"$set": {"hashed_password": hashed_password}},
+            )
+        return self._construct(user_data)
+
+    async def verify_user_password(
+        self, email: str, password: Union[str, bytes]
+    ) -> bool:
+        """Verify a user's password. Prefer authenticate() when the user is needed."""
         user_data = await self.collection.find_one({"email": email})
         if not user_data or "hashed_password" not in user_data:
             return False
 
-        return verify_password(password, user_data["hashed_password"])
+        return await self._verify_password(
+            email, password, user_data["hashed_password"]
+        )
+
+    async def verify_many(
+        self, creds: List[Tuple[str, Union[str, bytes]]]
+    ) -> List[bool]:
+        """Verify several (email, password) pairs with a single query."""
+        if not creds:
+            return []
+        cursor = self.collection.find(
+            {"email": {"$in": list({email for email, _ in creds})}},
+            _VERIFY_PROJECTION,
+        )
+        hashes = {
+            doc["email"]: doc["hashed_password"]
+            async for doc in cursor
+            if "hashed_password" in doc
+        }
+
+        async def verify(email: str, password: Union[str, bytes]) -> bool:
+            hashed_password = hashes.get(email)
+            if hashed_password is None:
+                return False
+            return await self._verify_password(email, password, hashed_password)
+
+        return list(await asyncio.gather(*(verify(email, pw) for email, pw in creds)))
 
     async def get_user_with_password(self, email: str) -> Optional[User]:
         """Get user data including hashed password for authentication."""
         user_data = await self.collection.find_one({"email": email})
         if not user_data:
             return None
-        return User(**user_data)
+        return self._construct(user_data)
 
     # Aggregation Pipeline Methods
 
@@ -78,69 +517,9 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
             - users_by_month: Users created by month
             - average_username_length: Average username length
         """
-        pipeline: List[Dict[str, Any]] = [
-            {
-                "$facet": {
-                    "total_users": [{"$count": "count"}],
-                    "active_users": [
-                        {"$match": {"is_active": True}},
-                        {"$count": "count"},
-                    ],
-                    "superusers": [
-                        {"$match": {"is_superuser": True}},
-                        {"$count": "count"},
-                    ],
-                    "users_by_month": [
-                        {
-                            "$group": {
-                                "_id": {
-                                    "year": {"$year": "$created_at"},
-                                    "month": {"$month": "$created_at"},
-                                },
-                                "count": {"$sum": 1},
-                            }
-                        },
-                        {"$sort": {"_id.year": 1, "_id.month": 1}},
-                    ],
-                    "average_username_length": [
-                        {
-                            "$group": {
-                                "_id": None,
-                                "avg_length": {"$avg": {"$strLenCP": "$username"}},
-                            }
-                        }
-                    ],
-                }
-            }
-        ]
+        pipeline: List[Dict[str, Any]] = list(_USER_STATS_PIPELINE)
 
-        result = await self.aggregate_single(pipeline)
-        if not result:
-            return {
-                "total_users": 0,
-                "active_users": 0,
-                "superusers": 0,
-                "users_by_month": [],
-                "average_username_length": 0,
-            }
-
-        return {
-            "total_users": result["total_users"][0]["count"]
-            if result["total_users"]
-            else 0,
-            "active_users": result["active_users"][0]["count"]
-            if result["active_users"]
-            else 0,
-            "superusers": result["superusers"][0]["count"]
-            if result["superusers"]
-            else 0,
-            "users_by_month": result["users_by_month"],
-            "average_username_length": round(
-                result["average_username_length"][0]["avg_length"], 2
-            )
-            if result["average_username_length"]
-            else 0,
-        }
+        return _format_user_statistics(await self.aggregate_single(pipeline))
 
     async def get_users_by_activity_status(
         self, limit: int = 10
@@ -154,35 +533,7 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
         Returns:
             List of users grouped by activity status
         """
-        pipeline: List[Dict[str, Any]] = [
-            {
-                "$group": {
-                    "_id": "$is_active",
-                    "users": {
-                        "$push": {
-                            "id": "$_id",
-                            "username": "$username",
-                            "email": "$email",
-                            "full_name": "$full_name",
-                            "created_at": "$created_at",
-                        }
-                    },
-                    "count": {"$sum": 1},
-                }
-            },
-            {
-                "$project": {
-                    "status": {
-                        "$cond": {"if": "$_id", "then": "active", "else": "inactive"}
-                    },
-                    "count": 1,
-                    "users": {"$slice": ["$users", limit]},
-                }
-            },
-            {"$sort": {"count": -1}},
-        ]
-
-        return await self.aggregate(pipeline)
+        return await self.aggregate(_activity_pipeline(limit))
 
     async def get_recent_users_with_details(
         self, days: int = 30
@@ -196,51 +547,13 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
         Returns:
             List of recent users with computed fields
         """
-        from datetime import datetime, timedelta, timezone
-
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
-
-        pipeline: List[Dict[str, Any]] = [
-            {"$match": {"created_at": {"$gte": cutoff_date}}},
-            {
-                "$addFields": {
-                    "days_since_created": {
-                        "$floor": {
-                            "$divide": [
-                                {
-                                    "$subtract": [
-                                        datetime.now(timezone.utc),
-                                        "$created_at",
-                                    ]
-                                },
-                                1000 * 60 * 60 * 24,  # milliseconds in a day
-                            ]
-                        }
-                    },
-                    "has_full_name": {"$ne": ["$full_name", None]},
-                    "email_domain": {
-                        "$substr": ["$email", {"$indexOfBytes": ["$email", "@"]}, -1]
-                    },
-                }
-            },
-            {
-                "$project": {
-                    "_id": 1,
-                    "username": 1,
-                    "email": 1,
-                    "full_name": 1,
-                    "is_active": 1,
-                    "is_superuser": 1,
-                    "created_at": 1,
-                    "days_since_created": 1,
-                    "has_full_name": 1,
-                    "email_domain": 1,
-                }
-            },
-            {"$sort": {"created_at": -1}},
-        ]
+        return await self.aggregate(_recent_users_pipeline(days))
 
-        return await self.aggregate(pipeline)
+    def iter_recent_users_with_details(
+        self, days: int = 30
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream recent users with computed fields without buffering them."""
+        return self.aiter_aggregate(_recent_users_pipeline(days))
 
     async def get_user_growth_trend(self, months: int = 12) -> List[Dict[str, Any]]:
         """
@@ -252,72 +565,58 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
         Returns:
             List of monthly user growth data
         """
-        from datetime import datetime, timedelta, timezone
+        return await self.aggregate(_growth_pipeline(months))
 
-        end_date = datetime.now(timezone.utc)
-        start_date = end_date - timedelta(days=months * 30)
+    async def get_dashboard_stats(
+        self,
+        activity_limit: int = 10,
+        recent_days: int = 30,
+        growth_months: int = 12,
+        recent_limit: int = 50,
+    ) -> Dict[str, Any]:
+        """
+        Get statistics, activity, growth and recent users in one aggregation.
 
+        The sub-pipelines run as $facet branches over a single collection
+        scan, so a dashboard costs one round trip instead of four. Branches
+        cannot use indexes, so the individual methods remain the better fit
+        when only one of these is needed. The whole result must fit in one
+        16 MB document, so only the newest recent_limit recent users are
+        included; stream the rest from iter_recent_users_with_details.
+
+        Args:
+            activity_limit: Maximum users per activity status
+            recent_days: Number of days to look back for recent users
+            growth_months: Number of months to analyze for growth
+            recent_limit: Maximum number of recent users to include
+
+        Returns:
+            Dictionary with statistics, activity, growth and recent_users
+        """
         pipeline: List[Dict[str, Any]] = [
-            {"$match": {"created_at": {"$gte": start_date, "$lte": end_date}}},
-            {
-                "$group": {
-                    "_id": {
-                        "year": {"$year": "$created_at"},
-                        "month": {"$month": "$created_at"},
-                    },
-                    "new_users": {"$sum": 1},
-                    "active_users": {"$sum": {"$cond": ["$is_active", 1, 0]}},
-                    "superusers": {"$sum": {"$cond": ["$is_superuser", 1, 0]}},
-                }
-            },
             {
-                "$project": {
-                    "_id": 0,
-                    "year": "$_id.year",
-                    "month": "$_id.month",
-                    "new_users": 1,
-                    "active_users": 1,
-                    "superusers": 1,
-                    "month_name": {
-                        "$switch": {
-                            "branches": [
-                                {"case": {"$eq": ["$_id.month", 1]}, "then": "January"},
-                                {
-                                    "case": {"$eq": ["$_id.month", 2]},
-                                    "then": "February",
-                                },
-                                {"case": {"$eq": ["$_id.month", 3]}, "then": "March"},
-                                {"case": {"$eq": ["$_id.month", 4]}, "then": "April"},
-                                {"case": {"$eq": ["$_id.month", 5]}, "then": "May"},
-                                {"case": {"$eq": ["$_id.month", 6]}, "then": "June"},
-                                {"case": {"$eq": ["$_id.month", 7]}, "then": "July"},
-                                {"case": {"$eq": ["$_id.month", 8]}, "then": "August"},
-                                {
-                                    "case": {"$eq": ["$_id.month", 9]},
-                                    "then": "September",
-                                },
-                                {
-                                    "case": {"$eq": ["$_id.month", 10]},
-                                    "then": "October",
-                                },
-                                {
-                                    "case": {"$eq": ["$_id.month", 11]},
-                                    "then": "November",
-                                },
-                                {
-                                    "case": {"$eq": ["$_id.month", 12]},
-                                    "then": "December",
-                                },
-                            ],
-                            "default": "Unknown",
-                        }
-                    },
+                "$facet": {
+                    "statistics": list(_USER_STATS_PIPELINE),
+                    "activity": _activity_pipeline(activity_limit),
+                    "growth": _growth_pipeline(growth_months),
+                    "recent_users": [
+                        *_recent_users_pipeline(recent_days),
+                        {"$limit": recent_limit},
+                    ],
                 }
-            },
-            {"$sort": {"year": 1, "month": 1}},
+            }
         ]
 
-        return await self.aggregate(pipeline)
+        result = await self.aggregate_single(pipeline) or {}
+        statistics = result.get("statistics")
+        return {
+            "statistics": _format_user_statistics(
+                statistics[0] if statistics else None
+            ),
+            "activity": result.get("activity", []),
+            "growth": result.get("growth", []),
+            "recent_users": result.get("recent_users", []),
+        }
 
     async def search_users_advanced(
         self,
@@ -327,60 +626,65 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
         sort_order: int = -1,
         limit: int = 20,
         skip: int = 0,
+        prefix: bool = False,
     ) -> Dict[str, Any]:
         """
         Advanced user search with aggregation pipeline.
 
+        Matches whole words through the users text index. With prefix=True the
+        term is instead matched as a literal, case-sensitive username prefix.
+        An anchored, case-sensitive regex gets tight bounds on the username
+        index, so partial, as-you-type queries scan only the matching keys.
+
         Args:
             search_term: Text to search in username, email, and full_name
             filters: Additional filters to apply
-            sort_by: Field to sort by
+            sort_by: Field to sort by, or "relevance" for text score order
             sort_order: 1 for ascending, -1 for descending
             limit: Maximum number of results
             skip: Number of results to skip
+            prefix: Match search_term as a case-sensitive username prefix
 
         Returns:
             Dictionary with search results and metadata
         """
         # Build match stage
-        match_stage = {
-            "$or": [
-                {"username": {"$regex": search_term, "$options": "i"}},
-                {"email": {"$regex": search_term, "$options": "i"}},
-                {"full_name": {"$regex": search_term, "$options": "i"}},
-            ]
-        }
+        match_stage: Dict[str, Any]
+        if prefix:
+            pattern = f"^{re.escape(search_term)}"
+            match_stage = {"username": {"$regex": pattern}}
+        else:
+            match_stage = {"$text": {"$search": search_term}}
 
         # Add additional filters
         if filters:
             match_stage.update(filters)
 
-        pipeline: List[Dict[str, Any]] = [
-            {"$match": match_stage},
+        pipeline: List[Dict[str, Any]] = [{"$match": match_stage}]
+        if not prefix:
+            pipeline.append(_SEARCH_SCORE_STAGE)
+
+        if sort_by != "relevance":
+            sort_stage = {"$sort": {sort_by: sort_order}}
+        elif prefix:
+            sort_stage = {"$sort": {"username": 1}}
+        else:
+            sort_stage = {"$sort": {"score": -1}}
+
+        pipeline.append(
             {
                 "$facet": {
                     "data": [
-                        {"$sort": {sort_by: sort_order}},
+                        sort_stage,
                         {"$skip": skip},
                         {"$limit": limit},
-                        {
-                            "$project": {
-                                "_id": 1,
-                                "username": 1,
-                                "email": 1,
-                                "full_name": 1,
-                                "is_active": 1,
-                                "is_superuser": 1,
-                                "created_at": 1,
-                                "updated_at": 1,
-                            }
-                        },
+                        _SEARCH_PROJECT_STAGE,
                     ],
                     "total": [{"$count": "count"}],
-                    "facets": [{"$group": {"_id": "$is_active", "count": {"$sum": 1}}}],
+                    "facets": list(_SEARCH_FACETS),
                 }
-            },
-        ]
+            }
+        )
 
         result = await self.aggregate_single(pipeline)
         if not result:
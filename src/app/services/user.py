@@ -1,8 +1,23 @@
-from typing import List, Optional, Dict, Any
+import asyncio
+from typing import List, Optional, Dict, Any, AsyncIterator
+
+from pymongo.errors import DuplicateKeyError
 
 from ..models.user import User, UserCreate, UserUpdate
 from ..repositories.user import UserRepository
 
+EMAIL_TAKEN = "Email already registered"
+USERNAME_TAKEN = "Username already taken"
+
+
+def _duplicate_key_message(error: DuplicateKeyError) -> str:
+    """Name the unique field a write collided on, for a racing duplicate."""
+    details = error.details or {}
+    fields = details.get("keyPattern") or details.get("keyValue") or {}
+    if "username" in fields or (not fields and "username" in str(error)):
+        return USERNAME_TAKEN
+    return EMAIL_TAKEN
+
 
 class UserService:
     """User service for business logic operations."""
@@ -12,15 +27,23 @@ class UserService:
 
     async def create_user(self, user_in: UserCreate) -> User:
         """Create a new user with validation."""
-        # Check if email is already taken
-        if await self.repository.is_email_taken(user_in.email):
-            raise ValueError("Email already registered")
+        email_taken, username_taken = await self.repository.find_conflicting(
+            email=user_in.email, username=user_in.username
+        )
+        if email_taken:
+            raise ValueError(EMAIL_TAKEN)
+        if username_taken:
+            raise ValueError(USERNAME_TAKEN)
 
-        # Check if username is already taken
-        if await self.repository.is_username_taken(user_in.username):
-            raise ValueError("Username already taken")
+        try:
+            return await self.repository.create_user(user_in)
+        except DuplicateKeyError as e:
+            # Another request registered the same value after the check above
+            raise ValueError(_duplicate_key_message(e)) from e
 
-        return await self.repository.create_user(user_in)
+    async def authenticate_user(self, email: str, password: str) -> Optional[User]:
+        """Get user by email if the password is correct."""
+        return await self.repository.authenticate(email, password)
 
     async def get_user(self, user_id: str) -> Optional[User]:
         """Get user by ID."""
@@ -34,28 +57,35 @@ class UserService:
         """Get user by username."""
         return await self.repository.get_by_username(username)
 
-    async def get_users(self, skip: int = 0, limit: int = 100) -> List[User]:
+    async def get_users(
+        self, skip: int = 0, limit: int = 100, after_id: Optional[str] = None
+    ) -> List[User]:
         """Get multiple users with pagination."""
-        return await self.repository.get_multi(skip=skip, limit=limit)
+        return await self.repository.get_multi(
+            skip=skip, limit=limit, after_id=after_id
+        )
 
     async def update_user(self, user_id: str, user_in: UserUpdate) -> Optional[User]:
         """Update user with validation."""
-        # Check if user exists
-        existing_user = await self.repository.get(user_id)
+        # Look the user up and check the new email or username against other
+        # users concurrently; neither query depends on the other
+        existing_user, (email_taken, username_taken) = await asyncio.gather(
+            self.repository.get(user_id),
+            self.repository.find_conflicting(
+                email=user_in.email, username=user_in.username, exclude_id=user_id
+            ),
+        )
         if not existing_user:
             return None
+        if email_taken:
+            raise ValueError(EMAIL_TAKEN)
+        if username_taken:
+            raise ValueError(USERNAME_TAKEN)
 
-        # Check if new email is already taken by another user
-        if user_in.email and user_in.email != existing_user.email:
-            if await self.repository.is_email_taken(user_in.email):
-                raise ValueError("Email already registered")
-
-        # Check if new username is already taken by another user
-        if user_in.username and user_in.username != existing_user.username:
-            if await self.repository.is_username_taken(user_in.username):
-                raise ValueError("Username already taken")
-
-        return await self.repository.update(id=user_id, obj_in=user_in)
+        try:
+            return await self.repository.update(id=user_id, obj_in=user_in)
+        except DuplicateKeyError as e:
+            raise ValueError(_duplicate_key_message(e)) from e
 
     async def delete_user(self, user_id: str) -> bool:
         """Delete user."""
@@ -87,10 +117,31 @@ class UserService:
         """Get recent users with computed fields."""
         return await self.repository.get_recent_users_with_details(days)
 
+    def iter_recent_users_with_details(
+        self, days: int = 30
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream recent users with computed fields."""
+        return self.repository.iter_recent_users_with_details(days)
+
     async def get_user_growth_trend(self, months: int = 12) -> List[Dict[str, Any]]:
         """Get user growth trend over time."""
         return await self.repository.get_user_growth_trend(months)
 
+    async def get_dashboard_stats(
+        self,
+        activity_limit: int = 10,
+        recent_days: int = 30,
+        growth_months: int = 12,
+        recent_limit: int = 50,
+    ) -> Dict[str, Any]:
+        """Get all dashboard analytics in a single aggregation."""
+        return await self.repository.get_dashboard_stats(
+            activity_limit=activity_limit,
+            recent_days=recent_days,
+            growth_months=growth_months,
+            recent_limit=recent_limit,
+        )
+
     async def search_users_advanced(
         self,
         search_term: str,
@@ -99,6 +150,7 @@ class UserService:
         sort_order: int = -1,
         limit: int = 20,
         skip: int = 0,
+        prefix: bool = False,
     ) -> Dict[str, Any]:
         """Advanced user search with aggregation pipeline."""
         return await self.repository.search_users_advanced(
@@ -108,4 +160,5 @@ class UserService:
             sort_order=sort_order,
             limit=limit,
             skip=skip,
+            prefix=prefix,
         )
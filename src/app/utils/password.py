@@ -1,22 +1,89 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Iterable, List, Optional, Union, cast
+
 import bcrypt
-from typing import Union, cast
 
+from ..core.config import BCRYPT_MAX_PASSWORD_BYTES, get_settings
+
+_PasswordHasher: Optional[type] = None
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+except ImportError:  # argon2 is an optional extra
+    pass
+else:
+    _PasswordHasher = PasswordHasher
+
+ARGON2_PREFIX = "$argon2"
+
+# bcrypt and argon2 both release the GIL while hashing, so one thread per core
+# hashes in parallel. A dedicated pool keeps hashing from starving the default
+# executor.
+_HASH_POOL = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="hash")
+
+
+@lru_cache(maxsize=1)
+def _argon2_hasher() -> Any:
+    if _PasswordHasher is None:
+        raise RuntimeError(
+            "PASSWORD_SCHEME=argon2 requires the argon2 extra "
+            "(pip install 'fastapi-mongo-boilerplate[argon2]')"
+        )
+    settings = get_settings()
+    return _PasswordHasher(
+        time_cost=settings.ARGON2_TIME_COST,
+        memory_cost=settings.ARGON2_MEMORY_COST,
+        parallelism=settings.ARGON2_PARALLELISM,
+    )
 
-def hash_password(password: Union[str, bytes]) -> str:
+
+def check_password_scheme() -> None:
+    """
+    Fail fast if the configured PASSWORD_SCHEME cannot be used.
+
+    Raises:
+        RuntimeError: If PASSWORD_SCHEME=argon2 but the argon2 extra is missing
     """
-    Hash a password using bcrypt.
+    if get_settings().PASSWORD_SCHEME == "argon2":
+        _argon2_hasher()
+
+
+def _as_str(value: Union[str, bytes]) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def _bcrypt_password(password: Union[str, bytes]) -> bytes:
+    if isinstance(password, str):
+        password = password.encode("utf-8")
+    if len(password) > BCRYPT_MAX_PASSWORD_BYTES:
+        raise ValueError(
+            f"bcrypt passwords must be at most {BCRYPT_MAX_PASSWORD_BYTES} bytes"
+        )
+    return password
+
+
+def hash_password(password: Union[str, bytes], rounds: Optional[int] = None) -> str:
+    """
+    Hash a password with the configured PASSWORD_SCHEME.
 
     Args:
         password: The plain text password to hash
+        rounds: bcrypt cost factor (defaults to the BCRYPT_ROUNDS setting)
 
     Returns:
         The hashed password as a string
+
+    Raises:
+        ValueError: If a bcrypt password is longer than 72 bytes
     """
-    if isinstance(password, str):
-        password = password.encode("utf-8")
+    if get_settings().PASSWORD_SCHEME == "argon2":
+        return cast(str, _argon2_hasher().hash(password))
 
-    salt: bytes = bcrypt.gensalt()
-    hashed: bytes = bcrypt.hashpw(password, salt)
+    salt: bytes = bcrypt.gensalt(rounds or get_settings().BCRYPT_ROUNDS)
+    hashed: bytes = bcrypt.hashpw(_bcrypt_password(password), salt)
     return hashed.decode("utf-8")
 
 
@@ -26,6 +93,9 @@ def verify_password(
     """
     Verify a password against its hash.
 
+    The scheme is read from the hash itself, so bcrypt hashes keep verifying
+    after switching PASSWORD_SCHEME to argon2.
+
     Args:
         password: The plain text password to verify
         hashed_password: The hashed password to check against
@@ -33,11 +103,88 @@ def verify_password(
     Returns:
         True if the password matches the hash, False otherwise
     """
+    if _as_str(hashed_password).startswith(ARGON2_PREFIX):
+        # Outside the try: without the extra the exception names are unbound.
+        hasher = _argon2_hasher()
+        try:
+            return cast(bool, hasher.verify(_as_str(hashed_password), password))
+        except (VerificationError, InvalidHashError):
+            return False
+
     if isinstance(password, str):
         password = password.encode("utf-8")
 
     if isinstance(hashed_password, str):
         hashed_password = hashed_password.encode("utf-8")
 
-    result: bool = cast(bool, bcrypt.checkpw(password, hashed_password))
+    # Hashes made before the length check cover only the first 72 bytes, so
+    # longer passwords are checked the way bcrypt used to truncate them.
+    result: bool = cast(
+        bool,
+        bcrypt.checkpw(password[:BCRYPT_MAX_PASSWORD_BYTES], hashed_password),
+    )
     return result
+
+
+def needs_rehash(hashed_password: Union[str, bytes]) -> bool:
+    """Check whether a hash was made with a scheme or cost that is not current."""
+    hashed_password = _as_str(hashed_password)
+    is_argon2 = hashed_password.startswith(ARGON2_PREFIX)
+    settings = get_settings()
+    if settings.PASSWORD_SCHEME == "argon2":
+        return not is_argon2 or bool(
+            _argon2_hasher().check_needs_rehash(hashed_password)
+        )
+    if is_argon2:
+        return True
+    # bcrypt hashes look like $2b$<cost>$<salt and digest>
+    try:
+        return int(hashed_password.split("$")[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+def hash_passwords_bulk(
+    passwords: Iterable[Union[str, bytes]], rounds: Optional[int] = None
+) -> List[str]:
+    """
+    Hash several passwords in parallel on the hashing thread pool.
+
+    Blocks until every hash is done; use hash_passwords_bulk_async from async
+    code.
+
+    Args:
+        passwords: The plain text passwords to hash
+        rounds: bcrypt cost factor (defaults to the BCRYPT_ROUNDS setting)
+
+    Returns:
+        The hashed passwords, in the same order
+    """
+    return list(_HASH_POOL.map(partial(hash_password, rounds=rounds), passwords))
+
+
+async def hash_password_async(
+    password: Union[str, bytes], rounds: Optional[int] = None
+) -> str:
+    """Hash a password on the hashing thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_HASH_POOL, hash_password, password, rounds)
+
+
+async def verify_password_async(
+    password: Union[str, bytes], hashed_password: Union[str, bytes]
+) -> bool:
+    """Verify a password on the hashing thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _HASH_POOL, verify_password, password, hashed_password
+    )
+
+
+async def hash_passwords_bulk_async(
+    passwords: Iterable[Union[str, bytes]], rounds: Optional[int] = None
+) -> List[str]:
+    """Hash several passwords in parallel on the hashing thread pool."""
+    return await asyncio.gather(
+        *(hash_password_async(password, rounds) for password in passwords)
+    )
@@ -0,0 +1,51 @@
+import bcrypt
+import pytest
+
+from src.app.core.config import get_settings
+from src.app.utils.password import hash_password
+
+TEST_PASSWORD = "testpassword123"
+
+# 22 characters of bcrypt's base64; the last one may only carry zero padding bits.
+_FIXED_SALT = b"abcdefghijklmnopqrstuu"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fast_password_hashing():
+    """
+    Hash with the minimum bcrypt cost for the whole test run.
+
+    Hashing strength is irrelevant to the tests and the default cost makes
+    every hash take a noticeable fraction of a second. Production code still
+    reads the cost from BCRYPT_ROUNDS; only pytest runs override it.
+    """
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("BCRYPT_ROUNDS", "4")
+        get_settings.cache_clear()
+        yield
+    get_settings.cache_clear()
+
+
+@pytest.fixture(scope="session")
+def precomputed_hash(fast_password_hashing):
+    """Hash of TEST_PASSWORD, computed once for the whole test run."""
+    return hash_password(TEST_PASSWORD)
+
+
+@pytest.fixture(autouse=True)
+def fixed_bcrypt_salt(request, monkeypatch):
+    """
+    Salt every bcrypt hash with the same fixed salt.
+
+    Hashing the same password twice gives the same hash, which keeps
+    assertions deterministic and skips os.urandom on every hash. The cost
+    factor is still honoured. Tests that need distinct salts opt out with
+    the real_salt marker.
+    """
+    if request.node.get_closest_marker("real_salt"):
+        return
+
+    def gensalt(rounds: int = 12, prefix: bytes = b"2b") -> bytes:
+        return b"$%s$%02d$%s" % (prefix, rounds, _FIXED_SALT)
+
+    monkeypatch.setattr(bcrypt, "gensalt", gensalt)
@@ -1,4 +1,5 @@
 import pytest
+from bson import ObjectId
 from unittest.mock import AsyncMock, patch, MagicMock
 
 from src.app.repositories.user import UserRepository
@@ -8,11 +9,11 @@ from src.app.services.user import UserService
 @pytest.fixture
 def mock_database():
     """Mock database connection."""
-    with patch("src.app.repositories.base.get_database") as mock_get_db:
+    with patch("src.app.repositories.base.get_collection") as mock_get_collection:
         mock_db = MagicMock()
         mock_collection = AsyncMock()
         mock_db.__getitem__.return_value = mock_collection
-        mock_get_db.return_value = mock_db
+        mock_get_collection.side_effect = mock_db.__getitem__
         yield mock_db, mock_collection
 
 
@@ -36,19 +37,19 @@ def user_service(user_repository):
 class TestUserRepositoryAggregation:
     """Test aggregation pipeline methods in UserRepository."""
 
-    @pytest.mark.asyncio
     async def test_get_user_statistics(self, user_repository):
         """Test user statistics aggregation."""
         # Mock the aggregation result
         mock_result = {
-            "total_users": [{"count": 100}],
-            "active_users": [{"count": 85}],
-            "superusers": [{"count": 5}],
+            "_id": None,
+            "total_users": 100,
+            "active_users": 85,
+            "superusers": 5,
+            "username_length": 850,
             "users_by_month": [
                 {"_id": {"year": 2024, "month": 1}, "count": 20},
                 {"_id": {"year": 2024, "month": 2}, "count": 25},
             ],
-            "average_username_length": [{"avg_length": 8.5}],
         }
 
         with patch.object(
@@ -62,7 +63,6 @@ class TestUserRepositoryAggregation:
             assert len(result["users_by_month"]) == 2
             assert result["average_username_length"] == 8.5
 
-    @pytest.mark.asyncio
     async def test_get_user_statistics_empty(self, user_repository):
         """Test user statistics when no data exists."""
         with patch.object(user_repository, "aggregate_single", return_value=None):
@@ -74,7 +74,6 @@ class TestUserRepositoryAggregation:
             assert result["users_by_month"] == []
             assert result["average_username_length"] == 0
 
-    @pytest.mark.asyncio
     async def test_get_users_by_activity_status(self, user_repository):
         """Test users grouped by activity status."""
         mock_result = [
@@ -103,7 +102,6 @@ class TestUserRepositoryAggregation:
             assert result[1]["status"] == "inactive"
             assert result[1]["count"] == 15
 
-    @pytest.mark.asyncio
     async def test_get_recent_users_with_details(self, user_repository):
         """Test recent users with computed fields."""
         mock_result = [
@@ -126,7 +124,6 @@ class TestUserRepositoryAggregation:
             assert result[0]["has_full_name"] is True
             assert result[0]["email_domain"] == "@example.com"
 
-    @pytest.mark.asyncio
     async def test_get_user_growth_trend(self, user_repository):
         """Test user growth trend aggregation."""
         mock_result = [
@@ -157,7 +154,44 @@ class TestUserRepositoryAggregation:
             assert result[0]["new_users"] == 20
             assert result[0]["month_name"] == "January"
 
-    @pytest.mark.asyncio
+    async def test_get_dashboard_stats(self, user_repository):
+        """Test dashboard analytics come from a single $facet aggregation."""
+        mock_result = {
+            "statistics": [
+                {
+                    "_id": None,
+                    "total_users": 4,
+                    "active_users": 3,
+                    "superusers": 1,
+                    "username_length": 30,
+                    "users_by_month": [],
+                }
+            ],
+            "activity": [{"status": "active", "count": 3, "users": []}],
+            "growth": [],
+            "recent_users": [{"_id": "1", "username": "user1"}],
+        }
+
+        with patch.object(
+            user_repository, "aggregate_single", return_value=mock_result
+        ) as mock_aggregate:
+            result = await user_repository.get_dashboard_stats(recent_limit=25)
+
+            pipeline = mock_aggregate.call_args[0][0]
+            assert len(pipeline) == 1
+            assert set(pipeline[0]["$facet"]) == {
+                "statistics",
+                "activity",
+                "growth",
+                "recent_users",
+            }
+            assert pipeline[0]["$facet"]["recent_users"][-1] == {"$limit": 25}
+            assert result["statistics"]["total_users"] == 4
+            assert result["statistics"]["average_username_length"] == 7.5
+            assert result["activity"][0]["status"] == "active"
+            assert result["growth"] == []
+            assert len(result["recent_users"]) == 1
+
     async def test_search_users_advanced(self, user_repository):
         """Test advanced user search with aggregation."""
         mock_result = {
@@ -185,7 +219,19 @@ class TestUserRepositoryAggregation:
             assert len(result["facets"]) == 1
             assert result["pagination"]["has_more"] is False
 
-    @pytest.mark.asyncio
+    async def test_search_users_advanced_prefix(self, user_repository):
+        """Test prefix search escapes the term and anchors it case-sensitively."""
+        with patch.object(
+            user_repository, "aggregate_single", return_value=None
+        ) as mock_aggregate:
+            await user_repository.search_users_advanced(
+                search_term="a.b", sort_by="relevance", prefix=True
+            )
+
+            pipeline = mock_aggregate.call_args[0][0]
+            assert pipeline[0] == {"$match": {"username": {"$regex": "^a\\.b"}}}
+            assert pipeline[1]["$facet"]["data"][0] == {"$sort": {"username": 1}}
+
     async def test_search_users_advanced_empty(self, user_repository):
         """Test advanced user search with no results."""
         with patch.object(user_repository, "aggregate_single", return_value=None):
@@ -202,7 +248,6 @@ class TestUserRepositoryAggregation:
 class TestUserServiceAggregation:
     """Test aggregation pipeline methods in UserService."""
 
-    @pytest.mark.asyncio
     async def test_get_user_statistics_service(self, user_service):
         """Test user statistics through service layer."""
         mock_stats = {
@@ -222,7 +267,6 @@ class TestUserServiceAggregation:
             assert result["active_users"] == 85
             assert result["superusers"] == 5
 
-    @pytest.mark.asyncio
     async def test_search_users_advanced_service(self, user_service):
         """Test advanced search through service layer."""
         mock_search_result = {
@@ -248,7 +292,6 @@ class TestUserServiceAggregation:
 class TestBaseRepositoryAggregation:
     """Test base repository aggregation methods."""
 
-    @pytest.mark.asyncio
     async def test_aggregate_method(self, mock_database):
         """Test basic aggregation method."""
         from src.app.repositories.base import BaseRepository
@@ -269,7 +312,50 @@ class TestBaseRepositoryAggregation:
             assert len(result) == 1
             assert result[0]["username"] == "user1"
 
-    @pytest.mark.asyncio
+    async def test_aiter_aggregate(self, mock_database):
+        """Test streaming aggregation yields documents from the cursor."""
+        from src.app.repositories.base import BaseRepository
+        from src.app.models.user import User
+
+        mock_db, mock_collection = mock_database
+        repo = BaseRepository(User, "users")
+        cursor = MagicMock()
+        cursor.__aiter__.return_value = [{"username": "user1"}, {"username": "u2"}]
+        repo.collection = MagicMock()
+        repo.collection.aggregate.return_value = cursor
+
+        pipeline = [{"$match": {"is_active": True}}]
+        result = [doc async for doc in repo.aiter_aggregate(pipeline)]
+
+        assert [doc["username"] for doc in result] == ["user1", "u2"]
+        repo.collection.aggregate.assert_called_once_with(
+            pipeline, allowDiskUse=False, batchSize=500
+        )
+
+    async def test_aiter_aggregate_error(self, mock_database):
+        """Test a failed stream is empty before the first row and aborts after."""
+        from pymongo.errors import OperationFailure
+        from src.app.repositories.base import BaseRepository
+        from src.app.models.user import User
+
+        async def failing_cursor(rows):
+            for row in rows:
+                yield row
+            raise OperationFailure("cursor killed")
+
+        repo = BaseRepository(User, "users")
+        repo.collection = MagicMock()
+
+        repo.collection.aggregate.return_value = failing_cursor([])
+        assert [doc async for doc in repo.aiter_aggregate([])] == []
+
+        rows = []
+        repo.collection.aggregate.return_value = failing_cursor([{"username": "u1"}])
+        with pytest.raises(OperationFailure):
+            async for doc in repo.aiter_aggregate([]):
+                rows.append(doc)
+        assert rows == [{"username": "u1"}]
+
     async def test_aggregate_with_model(self, mock_database):
         """Test aggregation with model instantiation."""
         from src.app.repositories.base import BaseRepository
@@ -296,8 +382,8 @@ class TestBaseRepositoryAggregation:
             assert len(result) == 1
             assert isinstance(result[0], User)
             assert result[0].username == "user1"
+            assert result[0].id == ObjectId("507f1f77bcf86cd799439011")
 
-    @pytest.mark.asyncio
     async def test_aggregate_count(self, mock_database):
         """Test aggregation count method."""
         from src.app.repositories.base import BaseRepository
@@ -0,0 +1,65 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import pytest
+
+from src.app.core import database as database_module
+from src.app.core.config import get_settings
+from src.app.core.database import (
+    Database,
+    connect_to_mongo,
+    get_collection,
+    warm_up_mongo,
+)
+
+
+@pytest.fixture
+def db():
+    """Fresh connection state with a mocked database."""
+    state = Database()
+    state.database = MagicMock()
+    state.database.__getitem__.side_effect = lambda name: Mock(name=name)
+    state.collections = {}
+    with patch.object(database_module, "db", state):
+        yield state
+
+
+def test_get_collection_reuses_handle(db):
+    """Test that a collection handle is built once per connection."""
+    users = get_collection("users")
+
+    assert get_collection("users") is users
+    assert get_collection("other") is not users
+    assert db.database.__getitem__.call_count == 2
+
+
+async def test_connect_to_mongo_resets_collection_cache(db):
+    """Test that a new connection does not hand out the old client's handles."""
+    stale = get_collection("users")
+
+    with patch.object(database_module, "AsyncIOMotorClient", MagicMock()):
+        await connect_to_mongo()
+
+    assert db.collections == {}
+    assert get_collection("users") is not stale
+
+
+async def test_warm_up_mongo_times_out_quietly(db):
+    """Test that a hanging ping gives up after MONGODB_PING_TIMEOUT."""
+
+    async def hang(name):
+        await asyncio.sleep(3600)
+
+    db.database.command = AsyncMock(side_effect=hang)
+    settings = get_settings().model_copy(update={"MONGODB_PING_TIMEOUT": 0.01})
+    with patch.object(database_module, "get_settings", lambda: settings):
+        await asyncio.wait_for(warm_up_mongo(), timeout=1)
+
+    db.database.command.assert_awaited_once_with("ping")
+
+
+async def test_warm_up_mongo_swallows_errors(db):
+    """Test that a failing ping does not stop startup."""
+    db.database.command = AsyncMock(side_effect=ConnectionError("refused"))
+
+    await warm_up_mongo()
@@ -1,6 +1,9 @@
+from datetime import datetime
+
 import pytest
 from fastapi.testclient import TestClient
 
+from src.app.core.database import get_db
 from src.app.main import app
 
 
@@ -15,5 +18,39 @@ def test_health_check(client):
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "healthy"
-    assert "timestamp" in data
+    assert datetime.fromisoformat(data["timestamp"]).microsecond == 0
     assert data["service"] == "FastAPI MongoDB Boilerplate"
+
+
+class _FakeDatabase:
+    def __init__(self, error: Exception | None = None):
+        self.error = error
+
+    async def command(self, name: str):
+        if self.error:
+            raise self.error
+        return {"ok": 1}
+
+
+def test_readiness_check(client):
+    """Test the readiness endpoint when the database answers the ping."""
+    app.dependency_overrides[get_db] = lambda: _FakeDatabase()
+    try:
+        response = client.get("/api/v1/health/ready")
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 200
+    assert response.json()["database"] == "connected"
+
+
+def test_readiness_check_timeout(client):
+    """Test that a ping timeout fails readiness with a 503."""
+    app.dependency_overrides[get_db] = lambda: _FakeDatabase(TimeoutError())
+    try:
+        response = client.get("/api/v1/health/db")
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 503
+    data = response.json()
+    assert data["status"] == "unhealthy"
+    assert data["error"] == "ping timed out"
@@ -0,0 +1,56 @@
+import pytest
+from bson import ObjectId
+from pydantic import ValidationError
+
+from src.app.core.config import get_settings
+from src.app.models import user as user_module
+from src.app.models.user import User, UserCreate
+
+OBJECT_ID = "507f1f77bcf86cd799439011"
+
+
+@pytest.mark.parametrize("value", [OBJECT_ID, ObjectId(OBJECT_ID)])
+def test_id_accepts_string_and_object_id(value):
+    """Test the id validates to an ObjectId from either form."""
+    user = User(_id=value, email="user@example.com", username="user1")
+
+    assert user.id == ObjectId(OBJECT_ID)
+
+
+def test_id_rejects_invalid_object_id():
+    """Test an invalid id is reported as a validation error."""
+    with pytest.raises(ValidationError):
+        User(_id="not-an-object-id", email="user@example.com", username="user1")
+
+
+def test_id_serializes_as_string_in_json():
+    """Test the id stays an ObjectId in Python and becomes a string in JSON."""
+    user = User(_id=OBJECT_ID, email="user@example.com", username="user1")
+
+    assert isinstance(user.model_dump()["id"], ObjectId)
+    assert user.model_dump(mode="json")["id"] == OBJECT_ID
+
+
+def test_id_json_schema_is_string():
+    """Test the id is documented as a string in the JSON schema."""
+    schema = User.model_json_schema()["properties"]["_id"]
+
+    assert {"type": "string", "format": "objectid"} in schema["anyOf"]
+
+
+def test_user_create_rejects_password_over_72_bytes():
+    """Test the password limit is counted in UTF-8 bytes, as bcrypt sees it."""
+    fields = {"email": "test@example.com", "username": "testuser"}
+
+    assert UserCreate(**fields, password="é" * 36).password == "é" * 36
+    with pytest.raises(ValidationError):
+        UserCreate(**fields, password="é" * 37)
+
+
+def test_user_create_allows_long_password_under_argon2(monkeypatch):
+    """Test the bcrypt byte limit does not apply to the argon2 scheme."""
+    settings = get_settings().model_copy(update={"PASSWORD_SCHEME": "argon2"})
+    monkeypatch.setattr(user_module, "get_settings", lambda: settings)
+
+    user = UserCreate(email="test@example.com", username="testuser", password="a" * 100)
+    assert len(user.password) == 100
@@ -1,4 +1,34 @@
-from src.app.utils.password import hash_password, verify_password
+import pytest
+from pydantic import ValidationError
+
+from src.app.core.config import Settings, get_settings
+from src.app.utils import password as password_module
+from src.app.utils.password import (
+    hash_password,
+    hash_password_async,
+    hash_passwords_bulk,
+    needs_rehash,
+    verify_password,
+    verify_password_async,
+)
+
+
+@pytest.fixture
+def argon2_scheme(monkeypatch):
+    """Switch PASSWORD_SCHEME to argon2 with cheap parameters."""
+    pytest.importorskip("argon2")
+    settings = get_settings().model_copy(
+        update={
+            "PASSWORD_SCHEME": "argon2",
+            "ARGON2_TIME_COST": 1,
+            "ARGON2_MEMORY_COST": 1024,
+            "ARGON2_PARALLELISM": 1,
+        }
+    )
+    monkeypatch.setattr(password_module, "get_settings", lambda: settings)
+    password_module._argon2_hasher.cache_clear()
+    yield
+    password_module._argon2_hasher.cache_clear()
 
 
 class TestPasswordHashing:
@@ -61,6 +91,12 @@ class TestPasswordHashing:
         # Hashes should be different
         assert hash1 != hash2
 
+    def test_fixed_salt_is_deterministic(self):
+        """Test that the suite-wide fixed salt makes hashes repeatable."""
+        assert hash_password("testpassword123") == hash_password("testpassword123")
+        assert hash_password("testpassword123", rounds=5).startswith("$2b$05$")
+
+    @pytest.mark.real_salt
     def test_same_password_different_salts(self):
         """Test that the same password produces different hashes due to salt."""
         password = "testpassword123"
@@ -74,3 +110,110 @@ class TestPasswordHashing:
         # But both should verify correctly
         assert verify_password(password, hash1) is True
         assert verify_password(password, hash2) is True
+
+    def test_hash_password_rounds(self):
+        """Test that the cost factor is encoded in the hash."""
+        hashed = hash_password("testpassword123", rounds=4)
+
+        assert hashed.startswith("$2b$04$")
+        assert verify_password("testpassword123", hashed) is True
+
+    def test_hash_password_over_72_bytes_rejected(self):
+        """Test that hashing rejects passwords bcrypt would truncate."""
+        hashed = hash_password("a" * 72)
+        assert verify_password("a" * 72, hashed) is True
+
+        # The limit is in bytes: 36 two-byte characters are 72 bytes
+        with pytest.raises(ValueError):
+            hash_password("é" * 37)
+
+    def test_verify_password_over_72_bytes_truncates(self):
+        """Test that long passwords still verify against legacy truncated hashes."""
+        legacy_hash = hash_password("a" * 72)
+
+        assert verify_password("a" * 72 + "tail", legacy_hash) is True
+        assert verify_password("b" * 73, legacy_hash) is False
+
+    async def test_async_hash_and_verify(self):
+        """Test hashing and verification on the bcrypt thread pool."""
+        hashed = await hash_password_async("testpassword123", rounds=4)
+
+        assert await verify_password_async("testpassword123", hashed) is True
+        assert await verify_password_async("wrongpassword123", hashed) is False
+
+    @pytest.mark.real_salt
+    def test_hash_passwords_bulk(self):
+        """Test that bulk hashing keeps order and salts every hash."""
+        passwords = ["password1", "password2", "password1"]
+        hashes = hash_passwords_bulk(passwords, rounds=4)
+
+        assert len(set(hashes)) == 3
+        assert all(
+            verify_password(password, hashed)
+            for password, hashed in zip(passwords, hashes)
+        )
+
+
+class TestArgon2Scheme:
+    """Test the opt-in argon2 password scheme."""
+
+    def test_password_scheme_setting(self, monkeypatch):
+        """Test the scheme is read case-insensitively and unknown ones fail."""
+        monkeypatch.setenv("PASSWORD_SCHEME", "Argon2")
+        assert Settings().PASSWORD_SCHEME == "argon2"
+
+        monkeypatch.setenv("PASSWORD_SCHEME", "md5")
+        with pytest.raises(ValidationError):
+            Settings()
+
+    def test_hash_and_verify(self, argon2_scheme):
+        """Test that argon2 hashes verify and reject wrong passwords."""
+        hashed = hash_password("testpassword123")
+
+        assert hashed.startswith("$argon2id$")
+        assert verify_password("testpassword123", hashed) is True
+        assert verify_password("wrongpassword123", hashed) is False
+        assert needs_rehash(hashed) is False
+
+    def test_legacy_bcrypt_hash(self, argon2_scheme):
+        """Test that bcrypt hashes still verify and are flagged for rehash."""
+        hashed = password_module.bcrypt.hashpw(
+            b"testpassword123", password_module.bcrypt.gensalt(4)
+        ).decode("utf-8")
+
+        assert verify_password("testpassword123", hashed) is True
+        assert needs_rehash(hashed) is True
+
+    def test_argon2_hash_without_extra(self, monkeypatch):
+        """Test that argon2 hashes ask for the extra when it is missing."""
+        monkeypatch.setattr(password_module, "_PasswordHasher", None)
+        password_module._argon2_hasher.cache_clear()
+        try:
+            with pytest.raises(RuntimeError, match="argon2 extra"):
+                verify_password("testpassword123", "$argon2id$v=19$m=1024,t=1,p=1$x$y")
+        finally:
+            password_module._argon2_hasher.cache_clear()
+
+    def test_check_password_scheme_without_extra(self, monkeypatch):
+        """Test that startup fails when argon2 is configured but not installed."""
+        settings = get_settings().model_copy(update={"PASSWORD_SCHEME": "argon2"})
+        monkeypatch.setattr(password_module, "get_settings", lambda: settings)
+        monkeypatch.setattr(password_module, "_PasswordHasher", None)
+        password_module._argon2_hasher.cache_clear()
+        try:
+            with pytest.raises(RuntimeError, match="argon2 extra"):
+                password_module.check_password_scheme()
+        finally:
+            password_module._argon2_hasher.cache_clear()
+
+        monkeypatch.setattr(password_module, "get_settings", get_settings)
+        password_module.check_password_scheme()
+
+    def test_bcrypt_scheme_does_not_rehash_bcrypt(self):
+        """Test that bcrypt hashes are current under the default scheme."""
+        assert needs_rehash(hash_password("testpassword123", rounds=4)) is False
+
+    def test_bcrypt_scheme_rehashes_other_cost(self):
+        """Test that bcrypt hashes made with another cost are flagged."""
+        assert get_settings().BCRYPT_ROUNDS == 4
+        assert needs_rehash(hash_password("testpassword123", rounds=5)) is True
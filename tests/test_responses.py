@@ -0,0 +1,33 @@
+from datetime import datetime
+
+import orjson
+import pytest
+from bson import ObjectId
+
+from src.app.core.responses import JSONArrayStreamingResponse, ORJSONResponse
+
+
+def test_orjson_response_serializes_bson_types():
+    """Test ObjectIds render as strings and naive datetimes as UTC."""
+    oid = ObjectId("507f1f77bcf86cd799439011")
+    response = ORJSONResponse({"_id": oid, "created_at": datetime(2024, 1, 1)})
+
+    assert orjson.loads(response.body) == {
+        "_id": "507f1f77bcf86cd799439011",
+        "created_at": "2024-01-01T00:00:00+00:00",
+    }
+
+
+@pytest.mark.parametrize("count", [0, 1, 3])
+async def test_json_array_streaming_response(count):
+    """Test streamed rows form a single valid JSON array."""
+
+    async def rows():
+        for i in range(count):
+            yield {"_id": ObjectId(), "n": i}
+
+    response = JSONArrayStreamingResponse(rows())
+    body = b"".join([chunk async for chunk in response.body_iterator])
+
+    assert [row["n"] for row in orjson.loads(body)] == list(range(count))
+    assert response.media_type == "application/json"
@@ -0,0 +1,64 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+from fastapi.testclient import TestClient
+
+from src.app.main import app
+
+
+def test_lifespan_rebuilds_user_service():
+    """Test that each lifespan binds a fresh user service to its own client."""
+    services = []
+    with (
+        patch("src.app.core.setup.connect_to_mongo"),
+        patch("src.app.core.setup.warm_up_mongo", new=AsyncMock()),
+        patch("src.app.core.setup.ensure_indexes", new=AsyncMock()),
+        patch("src.app.core.setup.close_mongo_connection"),
+        patch("src.app.repositories.base.get_collection", side_effect=Mock),
+    ):
+        for _ in range(2):
+            with TestClient(app):
+                services.append(app.state.user_service)
+
+    assert services[0] is not services[1]
+    assert services[0].repository.collection is not services[1].repository.collection
+
+
+async def test_connect_to_mongo_reads_aware_datetimes():
+    """Test that stored datetimes come back timezone-aware like new ones."""
+    from src.app.core.database import Database, connect_to_mongo
+
+    with (
+        patch("src.app.core.database.AsyncIOMotorClient") as mock_client,
+        patch("src.app.core.database.db", Database()),
+    ):
+        await connect_to_mongo()
+
+    assert mock_client.call_args.kwargs["tz_aware"] is True
+
+
+def test_lifespan_waits_for_index_task_before_closing():
+    """Test that shutdown finishes cancelling the index build before closing."""
+    events = []
+
+    async def ensure_indexes():
+        try:
+            await asyncio.sleep(3600)
+        except asyncio.CancelledError:
+            events.append("cancelled")
+            raise
+
+    with (
+        patch("src.app.core.setup.connect_to_mongo"),
+        patch("src.app.core.setup.warm_up_mongo", new=AsyncMock()),
+        patch("src.app.core.setup.ensure_indexes", new=ensure_indexes),
+        patch(
+            "src.app.core.setup.close_mongo_connection",
+            side_effect=lambda: events.append("closed"),
+        ),
+        patch("src.app.repositories.base.get_collection", side_effect=Mock),
+    ):
+        with TestClient(app):
+            pass
+
+    assert events == ["cancelled", "closed"]
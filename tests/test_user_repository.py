@@ -1,48 +1,210 @@
+import hashlib
 import pytest
-from unittest.mock import Mock, patch, AsyncMock
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from unittest.mock import AsyncMock, patch
+from src.app.core.config import get_settings
 from src.app.models.user import UserCreate
 from src.app.repositories.user import UserRepository
+from src.app.utils.password import verify_password_async
 
+_PW = b"testpassword123"
+_PW_STR = "testpassword123"
 
-class TestUserRepositoryPasswordHashing:
-    """Test user repository password hashing functionality."""
+# Validated once at import; tests only read it.
+_SAMPLE_USER = UserCreate(
+    email="test@example.com",
+    username="testuser",
+    full_name="Test User",
+    password=_PW_STR,
+)
 
-    @pytest.fixture
-    def user_repository(self):
-        """Create a user repository instance with mocked database."""
-        with patch("src.app.repositories.base.get_database") as mock_db:
-            # Mock the database to return a mock collection
-            mock_collection = AsyncMock()
-            mock_db.return_value = {"users": mock_collection}
 
-            repo = UserRepository()
-            return repo
+@dataclass(frozen=True, slots=True)
+class _InsertResult:
+    """The only InsertOneResult field the repository reads."""
+
+    inserted_id: str = "507f1f77bcf86cd799439011"
+
+
+@dataclass(frozen=True, slots=True)
+class _InsertManyResult:
+    """The only InsertManyResult field the repository reads."""
+
+    inserted_ids: List[str] = field(default_factory=list)
+
+
+class FakeCursor:
+    """Cursor over a fixed list of documents."""
+
+    __slots__ = ("documents", "limit_arg", "skip_arg", "sort_args", "batch_size_arg")
+
+    def __init__(self, documents: List[Dict[str, Any]]):
+        self.documents = documents
+        self.limit_arg: Optional[int] = None
+        self.skip_arg: Optional[int] = None
+        self.sort_args: Optional[tuple] = None
+        self.batch_size_arg: Optional[int] = None
+
+    def limit(self, limit: int) -> "FakeCursor":
+        self.limit_arg = limit
+        return self
+
+    def skip(self, skip: int) -> "FakeCursor":
+        self.skip_arg = skip
+        return self
+
+    def sort(self, *args: Any) -> "FakeCursor":
+        self.sort_args = args
+        return self
+
+    def batch_size(self, batch_size: int) -> "FakeCursor":
+        self.batch_size_arg = batch_size
+        return self
+
+    async def to_list(self, length: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self.documents[:length]
+
+    async def __aiter__(self):
+        for document in self.documents:
+            yield document
+
+
+class FakeCollection:
+    """
+    Async stand-in for the users collection.
+
+    Tests set the *_result slots and read back the last arguments, which is
+    all the repository needs and much cheaper per call than an AsyncMock.
+    """
+
+    __slots__ = (
+        "insert_one_result",
+        "insert_many_result",
+        "find_one_result",
+        "find_result",
+        "last_insert_arg",
+        "last_insert_many_arg",
+        "find_one_query",
+        "find_one_calls",
+        "find_query",
+        "find_calls",
+        "last_cursor",
+        "last_update",
+        "count_result",
+        "count_calls",
+        "count_query",
+    )
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.insert_one_result: Any = None
+        self.insert_many_result: Any = None
+        self.find_one_result: Optional[Dict[str, Any]] = None
+        self.find_result: List[Dict[str, Any]] = []
+        self.last_insert_arg: Optional[Dict[str, Any]] = None
+        self.last_insert_many_arg: Optional[List[Dict[str, Any]]] = None
+        self.find_one_query: Optional[Dict[str, Any]] = None
+        self.find_one_calls = 0
+        self.find_query: Optional[Dict[str, Any]] = None
+        self.find_calls = 0
+        self.last_cursor: Optional[FakeCursor] = None
+        self.last_update: Optional[tuple] = None
+        self.count_result = 0
+        self.count_calls: List[str] = []
+        self.count_query: Optional[Dict[str, Any]] = None
+
+    async def insert_one(self, document: Dict[str, Any]) -> Any:
+        self.last_insert_arg = document
+        return self.insert_one_result
+
+    async def insert_many(
+        self, documents: List[Dict[str, Any]], ordered: bool = True
+    ) -> Any:
+        self.last_insert_many_arg = documents
+        return self.insert_many_result
+
+    async def find_one(
+        self, query: Dict[str, Any], projection: Any = None
+    ) -> Optional[Dict[str, Any]]:
+        self.find_one_query = query
+        self.find_one_calls += 1
+        return self.find_one_result
+
+    def find(
+        self, query: Optional[Dict[str, Any]] = None, projection: Any = None
+    ) -> FakeCursor:
+        self.find_query = query
+        self.find_calls += 1
+        self.last_cursor = FakeCursor(self.find_result)
+        return self.last_cursor
+
+    async def update_one(self, query: Dict[str, Any], update: Dict[str, Any]) -> None:
+        self.last_update = (query, update)
+
+    async def estimated_document_count(self) -> int:
+        self.count_calls.append("estimated_document_count")
+        return self.count_result
+
+    async def count_documents(self, query: Dict[str, Any]) -> int:
+        self.count_calls.append("count_documents")
+        self.count_query = query
+        return self.count_result
+
+
+@pytest.fixture(scope="module")
+def fake_collection():
+    """Patch the collection lookup once for the module with a fake collection."""
+    collection = FakeCollection()
+    with patch("src.app.repositories.base.get_collection", return_value=collection):
+        yield collection
+
+
+@pytest.fixture
+def user_repository(fake_collection):
+    """Fresh user repository on a clean fake collection."""
+    fake_collection.reset()
+    return UserRepository()
+
+
+@pytest.fixture
+def caching_user_repository(fake_collection, monkeypatch):
+    """Fresh user repository with the verify cache turned on."""
+    fake_collection.reset()
+    monkeypatch.setenv("PASSWORD_VERIFY_CACHE_SIZE", "16")
+    get_settings.cache_clear()
+    yield UserRepository()
+    get_settings.cache_clear()
+
+
+@pytest.mark.xdist_group("bcrypt")
+class TestUserRepositoryPasswordHashing:
+    """Test user repository password hashing functionality."""
 
     @pytest.fixture
-    def sample_user_data(self):
-        """Create sample user data for testing."""
-        return {
-            "email": "test@example.com",
-            "username": "testuser",
-            "full_name": "Test User",
-            "password": "testpassword123",
-        }
+    def sample_user(self):
+        """Sample user input; the repository never mutates it, so it is shared."""
+        return _SAMPLE_USER
 
-    @pytest.mark.asyncio
-    async def test_create_user_hashes_password(self, user_repository, sample_user_data):
+    @patch(
+        "src.app.utils.password.bcrypt.hashpw",
+        return_value=b"$2b$04$stubbed_hash_value_ok_for_test",
+    )
+    async def test_create_user_hashes_password(
+        self, mock_hashpw, user_repository, sample_user
+    ):
         """Test that creating a user hashes the password."""
-        user_create = UserCreate(**sample_user_data)
+        user_create = sample_user
 
-        # Mock the collection.insert_one method
-        mock_result = Mock()
-        mock_result.inserted_id = "507f1f77bcf86cd799439011"  # Valid ObjectId
-        user_repository.collection.insert_one.return_value = mock_result
+        user_repository.collection.insert_one_result = _InsertResult()
 
         # Create the user
         user = await user_repository.create_user(user_create)
 
         # Verify that insert_one was called with hashed password
-        call_args = user_repository.collection.insert_one.call_args[0][0]
+        call_args = user_repository.collection.last_insert_arg
         assert "hashed_password" in call_args
         assert call_args["hashed_password"].startswith("$2b$")
         assert "password" not in call_args  # Original password should be removed
@@ -51,59 +213,372 @@ class TestUserRepositoryPasswordHashing:
         assert hasattr(user, "hashed_password")
         assert user.hashed_password is not None
         assert user.hashed_password.startswith("$2b$")
+        mock_hashpw.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_verify_user_password_correct(self, user_repository):
-        """Test that password verification works with correct password."""
-        # Create a real hash for testing
-        from src.app.utils.password import hash_password
+    def test_to_document_matches_model_dump(self, user_repository, sample_user):
+        """Test the document copy matches model_dump and is independent of it."""
+        document = user_repository._to_document(sample_user)
+        document.pop("password")
 
-        test_password = "testpassword123"
-        real_hash = hash_password(test_password)
+        assert sample_user.password == _PW_STR
+        assert user_repository._to_document(sample_user) == sample_user.model_dump()
 
-        # Mock the collection.find_one method to return user with real hash
-        user_repository.collection.find_one.return_value = {
-            "email": "test@example.com",
-            "hashed_password": real_hash,
-        }
+    @pytest.mark.parametrize(
+        "stored_user,password,expected",
+        [
+            (
+                lambda hashed: {"email": "test@example.com", "hashed_password": hashed},
+                _PW,
+                True,
+            ),
+            (lambda hashed: None, "anypassword", False),
+            (
+                lambda hashed: {"email": "test@example.com", "username": "testuser"},
+                "anypassword",
+                False,
+            ),
+        ],
+        ids=["correct", "user_not_found", "no_hash_field"],
+    )
+    async def test_verify_user_password(
+        self, user_repository, precomputed_hash, stored_user, password, expected
+    ):
+        """Test password verification against the stored user document."""
+        user_repository.collection.find_one_result = stored_user(precomputed_hash)
 
-        # Test that the method calls find_one with correct query
         result = await user_repository.verify_user_password(
-            "test@example.com", test_password
-        )
-        user_repository.collection.find_one.assert_called_with(
-            {"email": "test@example.com"}
+            "test@example.com", password
         )
-        assert result is True
 
-        # Test with wrong password
+        assert user_repository.collection.find_one_query == {
+            "email": "test@example.com"
+        }
+        assert result is expected
+
+    @patch("src.app.utils.password.bcrypt.checkpw", return_value=False)
+    async def test_verify_user_password_wrong(
+        self, mock_checkpw, user_repository, precomputed_hash
+    ):
+        """Test that password verification fails with a wrong password."""
+        user_repository.collection.find_one_result = {
+            "email": "test@example.com",
+            "hashed_password": precomputed_hash,
+        }
+
         result = await user_repository.verify_user_password(
             "test@example.com", "wrongpassword"
         )
         assert result is False
+        mock_checkpw.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_verify_user_password_user_not_found(self, user_repository):
-        """Test that password verification returns False for non-existent user."""
-        # Mock the collection.find_one method to return None
-        user_repository.collection.find_one.return_value = None
+    async def test_verify_user_password_not_cached_by_default(
+        self, user_repository, precomputed_hash
+    ):
+        """Test that every verification hashes unless the cache is turned on."""
+        user_repository.collection.find_one_result = {
+            "email": "test@example.com",
+            "hashed_password": precomputed_hash,
+        }
 
-        result = await user_repository.verify_user_password(
-            "nonexistent@example.com", "anypassword"
+        with patch(
+            "src.app.repositories.user.verify_password_async",
+            wraps=verify_password_async,
+        ) as mock_verify:
+            for _ in range(2):
+                assert await user_repository.verify_user_password(
+                    "test@example.com", _PW_STR
+                )
+            assert mock_verify.call_count == 2
+
+    async def test_verify_user_password_cached(
+        self, caching_user_repository, precomputed_hash
+    ):
+        """Test that a repeated correct verification skips the hash."""
+        from src.app.utils.password import hash_password
+
+        user_repository = caching_user_repository
+        user_repository.collection.find_one_result = {
+            "email": "test@example.com",
+            "hashed_password": precomputed_hash,
+        }
+
+        with patch(
+            "src.app.repositories.user.verify_password_async",
+            wraps=verify_password_async,
+        ) as mock_verify:
+            for _ in range(3):
+                assert await user_repository.verify_user_password(
+                    "test@example.com", _PW_STR
+                )
+            # bytes and str passwords share the cached match
+            assert await user_repository.verify_user_password("test@example.com", _PW)
+            assert mock_verify.call_count == 1
+
+            # A changed hash invalidates the cached match
+            user_repository.collection.find_one_result = {
+                "email": "test@example.com",
+                "hashed_password": hash_password("newpassword123"),
+            }
+            assert not await user_repository.verify_user_password(
+                "test@example.com", _PW_STR
+            )
+            assert mock_verify.call_count == 2
+
+    async def test_verify_cache_keys_are_not_plain_digests(
+        self, caching_user_repository, precomputed_hash
+    ):
+        """Test that cached password digests are keyed with a process secret."""
+        user_repository = caching_user_repository
+        assert await user_repository._verify_password(
+            "test@example.com", _PW, precomputed_hash
         )
-        assert result is False
 
-    @pytest.mark.asyncio
-    async def test_verify_user_password_no_hash_field(self, user_repository):
-        """Test that password verification returns False when user has no hash field."""
-        # Mock the collection.find_one method to return user without hash
-        user_repository.collection.find_one.return_value = {
+        [(email, digest)] = user_repository._verify_cache
+        assert email == "test@example.com"
+        assert digest != hashlib.sha256(_PW).digest()
+
+    def test_verify_uses_constant_time_compare(self):
+        """Test that cached hashes are compared in constant time."""
+        code = UserRepository._verify_password.__code__
+        assert "compare_digest" in code.co_names
+
+    async def test_authenticate(self, user_repository, precomputed_hash):
+        """Test that authenticate returns the user only for the right password."""
+        user_repository.collection.find_one_result = {
+            "_id": "507f1f77bcf86cd799439011",
             "email": "test@example.com",
             "username": "testuser",
-            # No hashed_password field
+            "hashed_password": precomputed_hash,
         }
 
-        result = await user_repository.verify_user_password(
-            "test@example.com", "anypassword"
+        user = await user_repository.authenticate("test@example.com", _PW_STR)
+        assert user is not None
+        assert user.username == "testuser"
+        assert user_repository.collection.find_one_calls == 1
+
+        user = await user_repository.authenticate("test@example.com", "wrongpassword")
+        assert user is None
+
+    async def test_authenticate_rehashes_outdated_hash(self, user_repository):
+        """Test that a login upgrades an outdated hash unless bcrypt cannot."""
+        from src.app.utils.password import hash_password
+
+        outdated_hash = hash_password(_PW_STR, rounds=5)
+        user_repository.collection.find_one_result = {
+            "_id": "507f1f77bcf86cd799439011",
+            "email": "test@example.com",
+            "username": "testuser",
+            "hashed_password": outdated_hash,
+        }
+        assert await user_repository.authenticate("test@example.com", _PW_STR)
+        query, update = user_repository.collection.last_update
+        # Filtered on the verified hash so a concurrent password change wins
+        assert query == {
+            "_id": "507f1f77bcf86cd799439011",
+            "hashed_password": outdated_hash,
+        }
+        assert update["$set"]["hashed_password"].startswith("$2b$04$")
+
+        # A legacy hash of a password over bcrypt's limit is kept as it is
+        user_repository.collection.last_update = None
+        user_repository.collection.find_one_result = {
+            "_id": "507f1f77bcf86cd799439011",
+            "email": "long@example.com",
+            "username": "longuser",
+            "hashed_password": hash_password("a" * 72, rounds=5),
+        }
+        assert await user_repository.authenticate("long@example.com", "a" * 80)
+        assert user_repository.collection.last_update is None
+
+    async def test_create_users_hashes_passwords(self, user_repository):
+        """Test that bulk creation hashes every password in one insert."""
+        users_in = [
+            UserCreate(
+                email=f"user{i}@example.com",
+                username=f"user{i}",
+                password=_PW_STR,
+            )
+            for i in range(3)
+        ]
+        user_repository.collection.insert_many_result = _InsertManyResult(
+            [
+                "507f1f77bcf86cd799439011",
+                "507f1f77bcf86cd799439012",
+                "507f1f77bcf86cd799439013",
+            ]
         )
-        assert result is False
+
+        users = await user_repository.create_users(users_in)
+
+        docs = user_repository.collection.last_insert_many_arg
+        assert len(docs) == 3
+        assert all("password" not in doc for doc in docs)
+        assert all(doc["hashed_password"].startswith("$2b$") for doc in docs)
+        assert [user.username for user in users] == ["user0", "user1", "user2"]
+
+    @pytest.mark.parametrize("method", ["create", "create_many"])
+    async def test_base_create_methods_hash_passwords(self, user_repository, method):
+        """Test that the inherited create methods never store the plain password."""
+        user_repository.collection.insert_one_result = _InsertResult()
+        user_repository.collection.insert_many_result = _InsertManyResult(
+            ["507f1f77bcf86cd799439011"]
+        )
+
+        if method == "create":
+            await user_repository.create(_SAMPLE_USER)
+            docs = [user_repository.collection.last_insert_arg]
+        else:
+            await user_repository.create_many([_SAMPLE_USER])
+            docs = user_repository.collection.last_insert_many_arg
+
+        assert len(docs) == 1
+        assert "password" not in docs[0]
+        assert docs[0]["hashed_password"].startswith("$2b$")
+
+    async def test_verify_many_batches_mongo_query(
+        self, user_repository, precomputed_hash
+    ):
+        """Test that several credentials are checked with a single query."""
+        user_repository.collection.find_result = [
+            {"email": "a@example.com", "hashed_password": precomputed_hash},
+            {"email": "b@example.com", "hashed_password": precomputed_hash},
+        ]
+
+        result = await user_repository.verify_many(
+            [
+                ("a@example.com", _PW),
+                ("b@example.com", "wrongpassword"),
+                ("missing@example.com", _PW_STR),
+            ]
+        )
+
+        assert result == [True, False, False]
+        assert user_repository.collection.find_calls == 1
+        assert sorted(user_repository.collection.find_query["email"]["$in"]) == [
+            "a@example.com",
+            "b@example.com",
+            "missing@example.com",
+        ]
+
+
+class TestUserRepositoryQueries:
+    """Test user repository lookups and pagination."""
+
+    async def test_find_conflicting(self, user_repository):
+        """Test that email and username conflicts come from a single query."""
+        user_repository.collection.find_result = [{"username": "testuser"}]
+
+        result = await user_repository.find_conflicting(
+            email="test@example.com",
+            username="testuser",
+            exclude_id="507f1f77bcf86cd799439011",
+        )
+
+        assert result == (False, True)
+        assert user_repository.collection.find_calls == 1
+        query = user_repository.collection.find_query
+        assert query["$or"] == [
+            {"email": "test@example.com"},
+            {"username": "testuser"},
+        ]
+        assert "$ne" in query["_id"]
+
+    async def test_find_conflicting_with_duplicate_emails(self, user_repository):
+        """Test that duplicate emails do not hide a username conflict."""
+        user_repository.collection.find_result = [
+            {"email": "test@example.com", "username": "first"},
+            {"email": "test@example.com", "username": "second"},
+            {"email": "other@example.com", "username": "testuser"},
+        ]
+
+        result = await user_repository.find_conflicting(
+            email="test@example.com", username="testuser"
+        )
+
+        assert result == (True, True)
+        assert user_repository.collection.last_cursor.limit_arg is None
+
+    async def test_count_uses_collection_metadata(self, user_repository):
+        """Test that count() reads the estimate instead of scanning."""
+        user_repository.collection.count_result = 42
+
+        assert await user_repository.count() == 42
+        assert user_repository.collection.count_calls == ["estimated_document_count"]
+
+    async def test_count_filtered_counts_matching_documents(self, user_repository):
+        """Test that count_filtered() counts exactly with the given query."""
+        user_repository.collection.count_result = 7
+
+        assert await user_repository.count_filtered({"is_active": True}) == 7
+        assert user_repository.collection.count_calls == ["count_documents"]
+        assert user_repository.collection.count_query == {"is_active": True}
+
+    async def test_get_multi_after_id(self, user_repository):
+        """Test keyset pagination walks _id from after_id instead of skipping."""
+        from bson import ObjectId
+
+        user_repository.collection.find_result = [
+            {"_id": "507f1f77bcf86cd799439012", "email": "a@example.com"}
+        ]
+
+        users = await user_repository.get_multi(
+            limit=10, after_id="507f1f77bcf86cd799439011"
+        )
+
+        assert len(users) == 1
+        assert user_repository.collection.find_query == {
+            "_id": {"$gt": ObjectId("507f1f77bcf86cd799439011")}
+        }
+        cursor = user_repository.collection.last_cursor
+        assert cursor.sort_args == ("_id", 1)
+        assert cursor.skip_arg == 0
+        assert (cursor.limit_arg, cursor.batch_size_arg) == (10, 10)
+
+    async def test_get_multi_pages_share_id_order(self, user_repository):
+        """Test the first page and the keyset page after it use the same order."""
+        from bson import ObjectId
+
+        collection = user_repository.collection
+        collection.find_result = [
+            {"_id": "507f1f77bcf86cd799439011", "email": "a@example.com"},
+            {"_id": "507f1f77bcf86cd799439012", "email": "b@example.com"},
+        ]
+        first_page = await user_repository.get_multi(limit=2)
+        assert collection.find_query == {}
+        assert collection.last_cursor.sort_args == ("_id", 1)
+
+        collection.find_result = [
+            {"_id": "507f1f77bcf86cd799439013", "email": "c@example.com"}
+        ]
+        second_page = await user_repository.get_multi(
+            limit=2, after_id=str(first_page[-1].id)
+        )
+        assert collection.find_query == {
+            "_id": {"$gt": ObjectId("507f1f77bcf86cd799439012")}
+        }
+        assert collection.last_cursor.sort_args == ("_id", 1)
+        assert [user.email for user in first_page + second_page] == [
+            "a@example.com",
+            "b@example.com",
+            "c@example.com",
+        ]
+
+
+async def test_ensure_indexes_builds_each_index_independently():
+    """Test that a failing unique index does not stop the other indexes."""
+    from pymongo.errors import DuplicateKeyError
+
+    async def create_index(keys: Any, **options: Any) -> None:
+        if options.get("unique"):
+            raise DuplicateKeyError("duplicate key")
+
+    collection = AsyncMock()
+    collection.create_index.side_effect = create_index
+    with patch("src.app.repositories.base.get_collection", return_value=collection):
+        await UserRepository().ensure_indexes()
+
+    keys = [call.args[0] for call in collection.create_index.call_args_list]
+    assert keys[1:] == ["email", "username"]
+    assert collection.create_index.call_args_list[0].kwargs == {
+        "name": "user_text_search"
+    }
@@ -0,0 +1,177 @@
+import pytest
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.app.models.user import User, UserCreate, UserUpdate
+from src.app.services.user import UserService
+
+_USER_ID = "507f1f77bcf86cd799439011"
+
+
+@pytest.fixture
+def mock_collection():
+    """Mock users collection."""
+    collection = AsyncMock()
+    with patch("src.app.repositories.base.get_collection", return_value=collection):
+        yield collection
+
+
+@pytest.fixture
+def user_service(mock_collection):
+    """User service on a mocked collection."""
+    return UserService()
+
+
+def _stored_users(collection, documents):
+    """Serve find() from documents, honouring the conflict query's _id filter."""
+
+    def find(query, projection=None):
+        excluded = query.get("_id", {}).get("$ne")
+        cursor = MagicMock()
+        cursor.to_list = AsyncMock(
+            return_value=[
+                doc
+                for doc in documents
+                if doc["_id"] != excluded
+                and any(
+                    doc.get(field) == value
+                    for clause in query["$or"]
+                    for field, value in clause.items()
+                )
+            ]
+        )
+        return cursor
+
+    collection.find = MagicMock(side_effect=find)
+
+
+class TestUserServiceConflicts:
+    """Test email and username conflict handling in UserService."""
+
+    async def test_create_user_email_conflict_wins(self, user_service):
+        """Test that an email conflict is reported before a username conflict."""
+        user_in = UserCreate(
+            email="test@example.com", username="testuser", password="password123"
+        )
+        with (
+            patch.object(
+                user_service.repository, "find_conflicting", return_value=(True, True)
+            ),
+            patch.object(user_service.repository, "create_user") as mock_create,
+        ):
+            with pytest.raises(ValueError, match="Email already registered"):
+                await user_service.create_user(user_in)
+
+        mock_create.assert_not_called()
+
+    async def test_update_missing_user_returns_none(self, user_service):
+        """Test that a missing user returns None even if the email is taken."""
+        with (
+            patch.object(user_service.repository, "get", return_value=None),
+            patch.object(
+                user_service.repository, "find_conflicting", return_value=(True, False)
+            ),
+        ):
+            result = await user_service.update_user(
+                _USER_ID, UserUpdate(email="taken@example.com")
+            )
+
+        assert result is None
+
+    async def test_update_user_email_conflict_wins(self, user_service):
+        """Test that an email conflict is reported before a username conflict."""
+        existing = User.model_construct(_id=ObjectId(_USER_ID))
+        with (
+            patch.object(user_service.repository, "get", return_value=existing),
+            patch.object(
+                user_service.repository, "find_conflicting", return_value=(True, True)
+            ),
+            patch.object(user_service.repository, "update") as mock_update,
+        ):
+            with pytest.raises(ValueError, match="Email already registered"):
+                await user_service.update_user(
+                    _USER_ID,
+                    UserUpdate(email="taken@example.com", username="taken"),
+                )
+
+        mock_update.assert_not_called()
+
+    async def test_update_user_keeps_own_email(self, user_service, mock_collection):
+        """Test that a user's own email and username are not reported as taken."""
+        _stored_users(
+            mock_collection,
+            [
+                {
+                    "_id": ObjectId(_USER_ID),
+                    "email": "test@example.com",
+                    "username": "testuser",
+                }
+            ],
+        )
+        existing = User.model_construct(_id=ObjectId(_USER_ID))
+        updated = User.model_construct(_id=ObjectId(_USER_ID), full_name="New Name")
+        user_in = UserUpdate(
+            email="test@example.com", username="testuser", full_name="New Name"
+        )
+        with (
+            patch.object(user_service.repository, "get", return_value=existing),
+            patch.object(
+                user_service.repository, "update", return_value=updated
+            ) as mock_update,
+        ):
+            result = await user_service.update_user(_USER_ID, user_in)
+
+        assert result is updated
+        mock_update.assert_awaited_once_with(id=_USER_ID, obj_in=user_in)
+        query = mock_collection.find.call_args.args[0]
+        assert query["_id"] == {"$ne": ObjectId(_USER_ID)}
+
+    @pytest.mark.parametrize(
+        "details,message",
+        [
+            ({"keyPattern": {"email": 1}}, "Email already registered"),
+            ({"keyPattern": {"username": 1}}, "Username already taken"),
+        ],
+        ids=["email", "username"],
+    )
+    async def test_create_user_duplicate_key_race(self, user_service, details, message):
+        """Test that a unique index collision after the check is a ValueError."""
+        user_in = UserCreate(
+            email="test@example.com", username="testuser", password="password123"
+        )
+        with (
+            patch.object(
+                user_service.repository,
+                "find_conflicting",
+                return_value=(False, False),
+            ),
+            patch.object(
+                user_service.repository,
+                "create_user",
+                side_effect=DuplicateKeyError("E11000 duplicate key", 11000, details),
+            ),
+        ):
+            with pytest.raises(ValueError, match=message):
+                await user_service.create_user(user_in)
+
+    async def test_update_user_duplicate_key_race(self, user_service):
+        """Test that a unique index collision on update is a ValueError."""
+        existing = User.model_construct(_id=ObjectId(_USER_ID))
+        with (
+            patch.object(user_service.repository, "get", return_value=existing),
+            patch.object(
+                user_service.repository,
+                "find_conflicting",
+                return_value=(False, False),
+            ),
+            patch.object(
+                user_service.repository,
+                "update",
+                side_effect=DuplicateKeyError(
+                    "E11000 duplicate key error index: username_1", 11000
+                ),
+            ),
+        ):
+            with pytest.raises(ValueError, match="Username already taken"):
+                await user_service.update_user(_USER_ID, UserUpdate(username="taken"))
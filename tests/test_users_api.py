@@ -0,0 +1,53 @@
+from fastapi.testclient import TestClient
+
+from src.app.api.v1.users import get_user_service
+from src.app.main import app
+
+
+def test_get_users_rejects_malformed_after_id():
+    """Test a corrupted pagination cursor is a client error, not an empty page."""
+    app.dependency_overrides[get_user_service] = lambda: None
+    try:
+        response = TestClient(app).get("/api/v1/users/", params={"after_id": "bad"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 422
+
+
+def _response_schema(path: str) -> dict:
+    operation = app.openapi()["paths"][path]["get"]
+    return operation["responses"]["200"]["content"]["application/json"]["schema"]
+
+
+def test_recent_users_openapi_schema():
+    """Test the streamed recent users route documents its array body."""
+    schema = _response_schema("/api/v1/users/analytics/recent-users")
+
+    assert schema["type"] == "array"
+    assert "days_since_created" in schema["items"]["properties"]
+
+
+def test_analytics_openapi_schemas():
+    """Test the ORJSONResponse analytics routes document their bodies."""
+    statistics = _response_schema("/api/v1/users/analytics/statistics")
+    activity = _response_schema("/api/v1/users/analytics/activity-status")
+    growth = _response_schema("/api/v1/users/analytics/growth-trend")
+    search = _response_schema("/api/v1/users/search/advanced")
+
+    assert "total_users" in statistics["properties"]
+    assert "status" in activity["items"]["properties"]
+    assert "month_name" in growth["items"]["properties"]
+    assert "pagination" in search["properties"]
+
+
+def test_dashboard_openapi_schema():
+    """Test the dashboard route documents each of its sections."""
+    schema = _response_schema("/api/v1/users/analytics/dashboard")
+
+    assert set(schema["properties"]) == {
+        "statistics",
+        "activity",
+        "growth",
+        "recent_users",
+    }